@@ -3,50 +3,74 @@
 import os
 import re
 import logging
+import functools
 
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    format='%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
-
 authinfo = os.path.join(os.path.expanduser("~"), ".authinfo")
 
+_MACHINE_RE = re.compile(r'machine\s+(\S+)')
+_LOGIN_RE = re.compile(r'login\s+(\S+)')
+_PASSWORD_RE = re.compile(r'password\s+(\S+)')
+
+
+@functools.lru_cache(maxsize=4)
+def _load_authinfo(path: str, mtime_ns: int) -> tuple[dict, dict]:
+    """
+    Parse an authinfo file into ({(machine, login): password},
+    {machine: {login: password}}).
+
+    The first mapping serves read_token: every entry is also reachable as
+    (machine, None), and lookups resolve to the first matching line, as
+    before. The second serves read_basic_users, where a repeated login keeps
+    its last password, as it always has. The mtime is part of the cache key,
+    so edits are picked up on the next call.
+    """
+    entries = {}
+    logins = {}
+    with open(path) as f:
+        for line in f:
+            m_machine = _MACHINE_RE.search(line)
+            m_pass = _PASSWORD_RE.search(line)
+            if not (m_machine and m_pass):
+                continue
+            machine, password = m_machine.group(1), m_pass.group(1)
+            m_login = _LOGIN_RE.search(line)
+            if m_login:
+                entries.setdefault((machine, m_login.group(1)), password)
+                logins.setdefault(machine, {})[m_login.group(1)] = password
+            entries.setdefault((machine, None), password)
+    return entries, logins
+
+
+def _authinfo_entries() -> tuple[dict, dict]:
+    return _load_authinfo(authinfo, os.stat(authinfo).st_mtime_ns)
+
 
 def read_token(machine: str, login: str | None = None) -> str:
     if not os.path.isfile(authinfo):
         raise FileNotFoundError(f"Credential store not found at {authinfo}")
 
-    with open(authinfo) as f:
-        for line in f:
-            if f"machine {machine}" not in line:
-                continue
-            if login is not None and f"login {login}" not in line:
-                continue
-            match = re.search(r'password\s+(\S+)', line)
-            if match:
-                return match.group(1)
+    password = _authinfo_entries()[0].get((machine, login))
+    if password is not None:
+        return password
 
     target = f"machine={machine}" + (f" login={login}" if login else "")
     raise ValueError(f"Credential not found for {target} in {authinfo}")
 
 
 def read_basic_users(machine='mister-anderson-webui'):
-    users = {}
     if not os.path.isfile(authinfo):
-        return users
-    with open(authinfo) as f:
-        for line in f:
-            if f"machine {machine}" in line:
-                m_login = re.search(r'login\s+(\S+)', line)
-                m_pass = re.search(r'password\s+(\S+)', line)
-                if m_login and m_pass:
-                    users[m_login.group(1)] = m_pass.group(1)
-    return users
+        return {}
+    return dict(_authinfo_entries()[1].get(machine, {}))
 
 
 if __name__ == "__main__":
+    try:
+        from .logging_setup import setup as setup_logging
+    except ImportError:  # run as a file (python src/config.py) rather than with -m
+        from logging_setup import setup as setup_logging
+    setup_logging()
     try:
         read_token('api.openai.com')
     except Exception:
@@ -1,25 +1,33 @@
 #!/usr/bin/env python3
 import os
+import atexit
 import logging
-import glob
+import functools
+import queue
+import threading
 from contextlib import contextmanager
+from typing import Iterable, Sequence
 import platform
 import sqlite3
 
 
-logging.basicConfig(
-    format="%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
 logger = logging.getLogger(__name__)
 
 
-def find_ucanaccess_jars():
+def _list_jars(directory: str) -> list[str]:
+    try:
+        with os.scandir(directory) as entries:
+            return [e.path for e in entries if e.name.endswith(".jar") and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+@functools.lru_cache(maxsize=1)
+def find_ucanaccess_jars() -> tuple[str, ...]:
     env = os.environ.get("UCANACCESS_CLASSPATH", "").strip()
     if not env:
         raise EnvironmentError("Undefined environment variable 'UCANACCESS_CLASSPATH'")
-    glob.glob(os.path.join(env, "*.jar"))
-    return [*glob.glob(os.path.join(env, "*.jar")), *glob.glob(os.path.join(env, "lib", "*.jar"))]
+    return (*_list_jars(env), *_list_jars(os.path.join(env, "lib")))
 
 
 def _connect_via_ucanaccess(accdb_path: str, new_db: str | None = None):
@@ -33,7 +41,7 @@ def _connect_via_ucanaccess(accdb_path: str, new_db: str | None = None):
         url += f";newdatabaseversion={new_db}"
     logger.debug("Connecting to %s via UCanAccess", url)
     driver = "net.ucanaccess.jdbc.UcanaccessDriver"
-    return jaydebeapi.connect(driver, url, jars=jars)
+    return jaydebeapi.connect(driver, url, jars=list(jars))
 
 
 def _connect_via_pyodbc(accdb_path: str):
@@ -45,12 +53,39 @@ def _connect_via_pyodbc(accdb_path: str):
             "Install it with `pip install pyodbc`."
         ) from exc
 
-    conn_str = (
+    logger.debug("Connecting to %s via pyodbc", accdb_path)
+    return pyodbc.connect(_odbc_conn_str(accdb_path), autocommit=True)
+
+
+def _odbc_conn_str(accdb_path: str) -> str:
+    return (
         r"Driver={Microsoft Access Driver (*.mdb, *.accdb)};"
         rf"Dbq={os.path.abspath(accdb_path)};"
     )
-    logger.debug("Connecting to %s via pyodbc", accdb_path)
-    return pyodbc.connect(conn_str, autocommit=True)
+
+
+def connect_turbodbc(accdb_path: str, read_rows: int = 10_000):
+    """
+    Open an unpooled turbodbc connection to the Access ODBC driver, whose
+    cursors can fetch results as Arrow tables of `read_rows` rows each.
+    Needs the ACE ODBC driver, so it is only available on Windows.
+    """
+    try:
+        import turbodbc  # type: ignore[import]
+    except ImportError as exc:
+        raise RuntimeError(
+            "turbodbc is required for the arrow engine. "
+            "Install it with `pip install turbodbc pyarrow`."
+        ) from exc
+    if platform.system() != "Windows":
+        raise RuntimeError("The arrow engine needs the Access ODBC driver, which is only available on Windows.")
+    options = turbodbc.make_options(
+        read_buffer_size=turbodbc.Rows(read_rows),
+        prefer_unicode=True,
+        autocommit=True,
+    )
+    logger.debug("Connecting to %s via turbodbc", accdb_path)
+    return turbodbc.connect(connection_string=_odbc_conn_str(accdb_path), turbodbc_options=options)
 
 
 def connect_access(accdb_path: str, new_db: str | None = None):
@@ -62,18 +97,109 @@ def connect_access(accdb_path: str, new_db: str | None = None):
     return _connect_via_ucanaccess(accdb_path, new_db)
 
 
+# Idle connections keyed by (absolute path, new_db). Opening a UCanAccess
+# connection loads the whole database through the JVM, so connections are
+# handed back here instead of being closed at the end of each `with` block.
+_POOL: dict[tuple[str, str | None], queue.Queue] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _pool_for(key: tuple[str, str | None]) -> queue.Queue:
+    with _POOL_LOCK:
+        pool = _POOL.get(key)
+        if pool is None:
+            pool = _POOL[key] = queue.Queue()
+        return pool
+
+
+def _is_open(conn) -> bool:
+    try:
+        return not conn.jconn.isClosed()
+    except AttributeError:
+        return True  # pyodbc has no cheap liveness probe
+    except Exception:
+        return False
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def _checkout(pool: queue.Queue, accdb_path: str, new_db: str | None):
+    while True:
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            return connect_access(accdb_path, new_db)
+        if _is_open(conn):
+            return conn
+        _close_quietly(conn)
+
+
+def _close_all() -> None:
+    """Close every idle pooled connection; registered to run at exit."""
+    with _POOL_LOCK:
+        pools = list(_POOL.values())
+        _POOL.clear()
+    for pool in pools:
+        while True:
+            try:
+                _close_quietly(pool.get_nowait())
+            except queue.Empty:
+                break
+
+
+atexit.register(_close_all)
+
+
 @contextmanager
 def connection(accdb_path: str, new_db: str = None):
-    conn = connect_access(accdb_path, new_db)
+    pool = _pool_for((os.path.abspath(accdb_path), new_db))
+    conn = _checkout(pool, accdb_path, new_db)
+    reusable = False
     try:
         yield conn
+        reusable = True
     finally:
-        conn.close()
+        # A connection that saw an error may be mid-transaction or broken;
+        # only clean exits go back to the pool.
+        if reusable:
+            pool.put(conn)
+        else:
+            _close_quietly(conn)
+
+
+def executemany_batched(conn, sql: str, rows: Iterable[Sequence[object]],
+                        fast_executemany: bool = False) -> None:
+    """
+    Execute `sql` once per row with cursor.executemany on a fresh cursor.
+
+    jaydebeapi already sends the rows as one JDBC batch (addBatch and a single
+    executeBatch). For pyodbc connections `fast_executemany` turns on ODBC
+    parameter arrays. Those bind every row with the types inferred from the
+    first one, so each column must hold one Python type (or None) throughout.
+    """
+    cur = conn.cursor()
+    if fast_executemany and hasattr(cur, "fast_executemany"):
+        cur.fast_executemany = True
+    try:
+        cur.executemany(sql, rows)
+    finally:
+        cur.close()
 
 
 if __name__ == "__main__":
     # Basic test connecting to a sample .accdb file
     import sys
+    try:
+        from ..logging_setup import setup as setup_logging
+    except ImportError:  # run as a file (python src/db/connect_access.py) rather than with -m
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from logging_setup import setup as setup_logging
+    setup_logging()
     accdb = sys.argv[1] if len(sys.argv) > 1 else None
     if not accdb:
         raise SystemExit("Usage: python connect_access.py path/to/db.accdb")
@@ -5,28 +5,37 @@ import logging
 from contextlib import contextmanager
 
 
-logging.basicConfig(
-    format="%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
 logger = logging.getLogger(__name__)
 
 
-PRAGMAS = [
-    "PRAGMA journal_mode=WAL",
-    "PRAGMA synchronous=NORMAL",
-    "PRAGMA foreign_keys=ON",
-]
+_PRAGMA_SQL = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA foreign_keys=ON;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+"""
 
 
 def apply_pragmas(conn: sqlite3.Connection):
-    for p in PRAGMAS:
-        logger.debug("Applying PRAGMA: %s", p)
-        conn.execute(p)
+    logger.debug("Applying PRAGMAs:%s", _PRAGMA_SQL.rstrip())
+    conn.executescript(_PRAGMA_SQL)
 
 
 def get_connection(path: str) -> sqlite3.Connection:
-    connection = sqlite3.connect(path)
+    """
+    Open `path` in autocommit mode (isolation_level=None).
+
+    The sqlite3 module no longer issues implicit BEGINs, so writes that should
+    be atomic or batched must run inside `transaction(conn)`.
+    """
+    connection = sqlite3.connect(
+        path,
+        isolation_level=None,
+        check_same_thread=False,
+        timeout=5.0,
+    )
     connection.row_factory = sqlite3.Row
     apply_pragmas(connection)
     logger.debug("Opened database at %s", path)
@@ -34,16 +43,82 @@ def get_connection(path: str) -> sqlite3.Connection:
 
 
 @contextmanager
-def connection(path = None):
+def transaction(conn: sqlite3.Connection, mode: str = "DEFERRED", pragmas: str = ""):
+    """
+    Wrap a block in BEGIN <mode> ... COMMIT, rolling back on error.
+    `pragmas` (e.g. "PRAGMA defer_foreign_keys=ON;") run right after BEGIN
+    in the same executescript call.
+    """
+    if pragmas:
+        # executescript would COMMIT an open transaction first; there is
+        # none here, since BEGIN is part of the script.
+        conn.executescript(f"BEGIN {mode};\n{pragmas}")
+    else:
+        conn.execute(f"BEGIN {mode}")
+    try:
+        yield conn
+        # COMMIT itself can fail (deferred foreign keys, SQLITE_BUSY) and
+        # leaves the transaction open when it does.
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+_BULK_LOAD_SQL = """
+PRAGMA synchronous=OFF;
+PRAGMA cache_size=-262144;
+"""
+
+# Values restored once a bulk load finishes; mirror _PRAGMA_SQL.
+_RESTORE_SQL = """
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-65536;
+"""
+
+
+@contextmanager
+def bulk_load(conn: sqlite3.Connection, foreign_keys: bool = True):
+    """
+    Relax durability for a large import: no fsyncs and a 256 MiB page cache.
+    Only use it for data that can be reloaded from its source, since power
+    loss mid-load can corrupt the file. With `foreign_keys=False`,
+    enforcement is also switched off so inserts skip the parent lookups;
+    the caller is then responsible for running PRAGMA foreign_key_check.
+    The usual PRAGMAs are restored on exit.
+    """
+    conn.executescript(_BULK_LOAD_SQL if foreign_keys else _BULK_LOAD_SQL + "PRAGMA foreign_keys=OFF;\n")
+    try:
+        yield conn
+    finally:
+        conn.executescript(_RESTORE_SQL if foreign_keys else _RESTORE_SQL + "PRAGMA foreign_keys=ON;\n")
+
+
+@contextmanager
+def connection(path = None, optimize: bool = False):
+    """
+    Yield a connection to `path`. With `optimize=True`, PRAGMA optimize runs
+    before closing so tables written through this connection get fresh
+    planner statistics.
+    """
     conn = get_connection(path)
     try:
         yield conn
+        if optimize:
+            conn.execute("PRAGMA optimize")
     finally:
         conn.close()
 
 
 if __name__ == "__main__":
     import sys
+    try:
+        from ..logging_setup import setup as setup_logging
+    except ImportError:  # run as a file (python src/db/connect_sqlite.py) rather than with -m
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from logging_setup import setup as setup_logging
+    setup_logging()
     path = sys.argv[1] if len(sys.argv) > 1 else None
     if not path:
         raise SystemExit("Usage: python connect_sqlite.py path/to/db.sqlite")
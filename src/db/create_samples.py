@@ -1,15 +1,23 @@
 import os
 import logging
 
-from .connect_access import connection as access_connection
-from .connect_sqlite import connection as sqlite_connection
+from .connect_access import connection as access_connection, executemany_batched
+from .connect_sqlite import connection as sqlite_connection, transaction as sqlite_transaction
+from ..logging_setup import setup as setup_logging
 
-logging.basicConfig(
-    format="%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
 logger = logging.getLogger(__name__)
 
+SAMPLE_PEOPLE = (
+    ("Alice", "alice@example.com"),
+    ("Bob", "bob@example.com"),
+    ("Carol", "carol@example.com"),
+)
+SAMPLE_ORDERS = (
+    (1, 120.50, "2024-06-01 10:00:00"),
+    (2,  75.00, "2024-06-02 14:30:00"),
+    (1, 250.00, "2024-06-03 09:15:00"),
+)
+
 
 def drop_object_if_exists(cur, name: str):
     # Is there a table/view with this name?
@@ -31,7 +39,7 @@ def drop_object_if_exists(cur, name: str):
 
 def accdb(path: str, version: str = "V2010"):
     with access_connection(path, version) as conn:
-        logger.info(f"Creating Access database at {path}")
+        logger.info("Creating Access database at %s", path)
         cur = conn.cursor()
         # Create a couple of sample tables
         # drop_object_if_exists(cur, "People")
@@ -53,28 +61,22 @@ def accdb(path: str, version: str = "V2010"):
                 CONSTRAINT FK_Orders_People FOREIGN KEY (PersonID) REFERENCES People(ID)
             )
         """)
-        cur.executemany(
+        executemany_batched(
+            conn,
             "INSERT INTO People (Name, Email) VALUES (?, ?)",
-            [
-                ("Alice", "alice@example.com"),
-                ("Bob", "bob@example.com"),
-                ("Carol", "carol@example.com"),
-            ],
+            SAMPLE_PEOPLE,
         )
-        cur.executemany(
+        executemany_batched(
+            conn,
             "INSERT INTO Orders (PersonID, Amount, OrderDate) VALUES (?, ?, ?)",
-            [
-                (1, 120.50, "2024-06-01 10:00:00"),
-                (2,  75.00, "2024-06-02 14:30:00"),
-                (1, 250.00, "2024-06-03 09:15:00"),
-            ],
+            SAMPLE_ORDERS,
         )
         conn.commit()
 
 
 def sqlite(path: str):
     with sqlite_connection(path) as conn:
-        logger.info(f"Creating SQLite database at {path}")
+        logger.info("Creating SQLite database at %s", path)
         cur = conn.cursor()
         # Recreate tables
         cur.executescript("""
@@ -95,27 +97,20 @@ def sqlite(path: str):
                 FOREIGN KEY (PersonID) REFERENCES People(ID)
             );
         """)
-        # Seed data
-        cur.executemany(
-            "INSERT INTO People (Name, Email) VALUES (?, ?)",
-            [
-                ("Alice", "alice@example.com"),
-                ("Bob", "bob@example.com"),
-                ("Carol", "carol@example.com"),
-            ],
-        )
-        cur.executemany(
-            "INSERT INTO Orders (PersonID, Amount, OrderDate) VALUES (?, ?, ?)",
-            [
-                (1, 120.50, "2024-06-01 10:00:00"),
-                (2,  75.00, "2024-06-02 14:30:00"),
-                (1, 250.00, "2024-06-03 09:15:00"),
-            ],
-        )
-        conn.commit()
+        # Seed data in a single transaction
+        with sqlite_transaction(conn, "IMMEDIATE"):
+            cur.executemany(
+                "INSERT INTO People (Name, Email) VALUES (?, ?)",
+                SAMPLE_PEOPLE,
+            )
+            cur.executemany(
+                "INSERT INTO Orders (PersonID, Amount, OrderDate) VALUES (?, ?, ?)",
+                SAMPLE_ORDERS,
+            )
 
 
 if __name__ == "__main__":
     # Test database connections
+    setup_logging()
     accdb(os.path.join("data", "sample.accdb"))
     sqlite(os.path.join("data", "sample.sqlite"))
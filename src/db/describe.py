@@ -1,18 +1,62 @@
 #!/usr/bin/env python3
 import os
+import copy
 import logging
+import functools
+from collections import defaultdict
 
 
-logging.basicConfig(
-    format="%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
 logger = logging.getLogger(__name__)
 
+# (.accdb path, TABLE) -> (file mtime, (cols, pk_cols, fks)). Any write to
+# the database file makes the stored description miss instead of going stale.
+# SQLite is not cached: describe_sqlite is two PRAGMAs, no dearer than
+# checking a schema version would be.
+_SCHEMA_CACHE: dict[tuple[str, str], tuple[object, tuple]] = {}
 
-def describe_access(connection, table):
+
+def _access_cache_key(connection, table, path=None):
+    if path is None:
+        try:
+            url = str(connection.jconn.getMetaData().getURL())
+        except Exception:
+            return None  # pyodbc connections don't expose it; callers pass `path`
+        path = url.split("//", 1)[-1].split(";", 1)[0]
+    try:
+        version = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return os.path.abspath(path), table.upper(), version
+
+
+def _cached_schema(key_func):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(connection, table, path=None):
+            key = key_func(connection, table, path)
+            if key is None:
+                return fn(connection, table)
+            path, name, version = key
+            entry = _SCHEMA_CACHE.get((path, name))
+            if entry is None or entry[0] != version:
+                entry = (version, fn(connection, table))
+                _SCHEMA_CACHE[(path, name)] = entry
+            # Callers get their own copy so they can't corrupt the cache.
+            return copy.deepcopy(entry[1])
+        return wrapper
+    return decorator
+
+
+def _describe_access_rows(connection, table=None) -> dict[str, tuple]:
+    """
+    Describe one Access table, or every table in the PUBLIC schema when
+    `table` is None, returning {TABLE_NAME: (cols, pk_cols, fks)}.
+    """
     cur = connection.cursor()
-    # Columns
+    # Every catalog view is filtered down to this table inside its own
+    # subselect; UCanAccess otherwise materializes the whole catalog before
+    # applying the outer WHERE.
+    flt, args = (" AND TABLE_NAME = UPPER(?)", [table]) if table else ("", [])
     cur.execute(f"""
         SELECT
           c.TABLE_NAME,
@@ -22,36 +66,36 @@ def describe_access(connection, table):
           c.IS_NULLABLE,
           pk.ORDINAL_POSITION AS PK_ORDINAL,
           CASE WHEN pk.COLUMN_NAME IS NULL THEN 0 ELSE 1 END AS IS_PK
-        FROM INFORMATION_SCHEMA.COLUMNS c
+        FROM (
+          SELECT * FROM INFORMATION_SCHEMA.COLUMNS
+          WHERE TABLE_SCHEMA = 'PUBLIC'{flt}
+        ) c
         LEFT JOIN (
-          SELECT kcu.TABLE_SCHEMA, kcu.TABLE_NAME, kcu.COLUMN_NAME, kcu.ORDINAL_POSITION
-          FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
-          JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu
-            ON kcu.CONSTRAINT_NAME = tc.CONSTRAINT_NAME
-           AND kcu.TABLE_SCHEMA    = tc.TABLE_SCHEMA
-           AND kcu.TABLE_NAME      = tc.TABLE_NAME
-          WHERE tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
+          SELECT kcu.TABLE_NAME, kcu.COLUMN_NAME, kcu.ORDINAL_POSITION
+          FROM (
+            SELECT CONSTRAINT_NAME, TABLE_NAME FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS
+            WHERE TABLE_SCHEMA = 'PUBLIC'{flt}
+              AND CONSTRAINT_TYPE = 'PRIMARY KEY'
+          ) tc
+          JOIN (
+            SELECT CONSTRAINT_NAME, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION
+            FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = 'PUBLIC'{flt}
+          ) kcu
+            ON  kcu.CONSTRAINT_NAME = tc.CONSTRAINT_NAME
+            AND kcu.TABLE_NAME      = tc.TABLE_NAME
         ) pk
-          ON  pk.TABLE_SCHEMA = c.TABLE_SCHEMA
-          AND pk.TABLE_NAME   = c.TABLE_NAME
-          AND pk.COLUMN_NAME  = c.COLUMN_NAME
-        WHERE c.TABLE_SCHEMA = 'PUBLIC'
-          AND c.TABLE_NAME   = '{table.upper()}'
-        ORDER BY c.ORDINAL_POSITION;
-    """)
-    rows = cur.fetchall()
-    cols = [
-        {
-            "name": r[1],                          # COLUMN_NAME
-            "type_name": (r[2] or ""),             # DATA_TYPE (string in UCanAccess)
-            "size": r[3],                          # CHARACTER_MAXIMUM_LENGTH
-            "nullable": (str(r[4]).upper() == "YES"),
-        }
-        for r in rows
-    ]
-    pk_cols = [r[1] for r in sorted((rr for rr in rows if rr[6]), key=lambda rr: (rr[5] or 0))]
-    cur.execute("""
+          ON  pk.TABLE_NAME  = c.TABLE_NAME
+          AND pk.COLUMN_NAME = c.COLUMN_NAME
+        ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+    """, args * 3)
+    rows_by_table = defaultdict(list)
+    for r in cur.fetchall():
+        rows_by_table[r[0]].append(r)
+
+    cur.execute(f"""
       SELECT
+        fk_cols.TABLE_NAME       AS FK_TABLE,
         rc.CONSTRAINT_NAME,
         fk_cols.COLUMN_NAME      AS FK_COLUMN,
         fk_cols.ORDINAL_POSITION AS FK_ORD,
@@ -59,13 +103,22 @@ def describe_access(connection, table):
         pk_cols.COLUMN_NAME      AS PK_COLUMN,
         rc.UPDATE_RULE,
         rc.DELETE_RULE
-      FROM INFORMATION_SCHEMA.REFERENTIAL_CONSTRAINTS rc
-      JOIN INFORMATION_SCHEMA.TABLE_CONSTRAINTS fk_tc
-        ON fk_tc.CONSTRAINT_NAME = rc.CONSTRAINT_NAME
-       AND fk_tc.TABLE_SCHEMA    = rc.CONSTRAINT_SCHEMA
-      JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE fk_cols
-        ON fk_cols.CONSTRAINT_NAME = fk_tc.CONSTRAINT_NAME
-       AND fk_cols.TABLE_SCHEMA    = fk_tc.TABLE_SCHEMA
+      FROM (
+        SELECT CONSTRAINT_NAME, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION
+        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = 'PUBLIC'{flt}
+      ) fk_cols
+      JOIN (
+        SELECT CONSTRAINT_NAME FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS
+        WHERE TABLE_SCHEMA = 'PUBLIC'{flt}
+          AND CONSTRAINT_TYPE = 'FOREIGN KEY'
+      ) fk_tc
+        ON fk_tc.CONSTRAINT_NAME = fk_cols.CONSTRAINT_NAME
+      JOIN (
+        SELECT * FROM INFORMATION_SCHEMA.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = 'PUBLIC'
+      ) rc
+        ON rc.CONSTRAINT_NAME = fk_tc.CONSTRAINT_NAME
       JOIN INFORMATION_SCHEMA.TABLE_CONSTRAINTS tgt_tc
         ON tgt_tc.CONSTRAINT_NAME = rc.UNIQUE_CONSTRAINT_NAME
        AND tgt_tc.TABLE_SCHEMA    = rc.UNIQUE_CONSTRAINT_SCHEMA
@@ -73,11 +126,33 @@ def describe_access(connection, table):
         ON pk_cols.CONSTRAINT_NAME = tgt_tc.CONSTRAINT_NAME
        AND pk_cols.TABLE_SCHEMA    = tgt_tc.TABLE_SCHEMA
        AND pk_cols.ORDINAL_POSITION = fk_cols.ORDINAL_POSITION
-      WHERE fk_tc.TABLE_SCHEMA = 'PUBLIC'
-        AND fk_tc.TABLE_NAME   = UPPER(?)
-      ORDER BY rc.CONSTRAINT_NAME, fk_cols.ORDINAL_POSITION
-    """, [table])
-    fk_rows = cur.fetchall()
+      ORDER BY fk_cols.TABLE_NAME, rc.CONSTRAINT_NAME, fk_cols.ORDINAL_POSITION
+    """, args * 2)
+    fk_rows_by_table = defaultdict(list)
+    for r in cur.fetchall():
+        fk_rows_by_table[r[0]].append(r[1:])
+
+    return {
+        name: (*_access_columns(rows), _access_fks(fk_rows_by_table.get(name, [])))
+        for name, rows in rows_by_table.items()
+    }
+
+
+def _access_columns(rows):
+    cols = [
+        {
+            "name": r[1],                          # COLUMN_NAME
+            "type_name": (r[2] or ""),             # DATA_TYPE (string in UCanAccess)
+            "size": r[3],                          # CHARACTER_MAXIMUM_LENGTH
+            "nullable": (str(r[4]).upper() == "YES"),
+        }
+        for r in rows
+    ]
+    pk_cols = [r[1] for r in sorted((rr for rr in rows if rr[6]), key=lambda rr: (rr[5] or 0))]
+    return cols, pk_cols
+
+
+def _access_fks(fk_rows):
     fks = {}
     for name, fk_col, ord_pos, pk_table, pk_col, on_upd, on_del in fk_rows:
         d = fks.setdefault(name, {
@@ -90,7 +165,7 @@ def describe_access(connection, table):
         })
         d["columns"].append((ord_pos, fk_col))
         d["ref_columns"].append((ord_pos, pk_col))
-    fks = [
+    return [
         {
             **d,
             "columns": [c for _, c in sorted(d["columns"])],
@@ -98,7 +173,117 @@ def describe_access(connection, table):
         }
         for d in fks.values()
     ]
-    return cols, pk_cols, fks
+
+
+# java.sql.Types codes whose COLUMN_SIZE is a character length, and
+# DatabaseMetaData.importedKey* rule codes.
+_JDBC_CHAR_TYPES = {1, 12, -1, -15, -9, -16, 2005, 2011}
+_JDBC_FK_RULES = {0: "CASCADE", 1: "RESTRICT", 2: "SET NULL", 3: "NO ACTION", 4: "SET DEFAULT"}
+
+
+def _jstr(value):
+    return None if value is None else str(value)
+
+
+def _iter_result_set(rs):
+    try:
+        while rs.next():
+            yield rs
+    finally:
+        rs.close()
+
+
+def _describe_access_jdbc(jconn, table=None) -> dict[str, tuple]:
+    """
+    Describe one Access table, or every table in the PUBLIC schema when
+    `table` is None, through JDBC DatabaseMetaData, which UCanAccess answers
+    from its in-memory catalog without running the INFORMATION_SCHEMA views.
+    Returns {TABLE_NAME: (cols, pk_cols, fks)} like _describe_access_rows.
+    UCanAccess reports Access's own mixed-case names, so keys and name
+    comparisons are upper-cased.
+    """
+    md = jconn.getMetaData()
+    name = table.upper() if table else None
+    cols_by_table = defaultdict(list)
+    spelled = {}
+    # Metadata arguments are LIKE patterns, so '_' in a name can match other
+    # tables; keep only exact matches.
+    for rs in _iter_result_set(md.getColumns(None, "PUBLIC", name, None)):
+        reported = _jstr(rs.getString("TABLE_NAME"))
+        table_name = reported.upper()
+        if name is not None and table_name != name:
+            continue
+        spelled[table_name] = reported
+        cols_by_table[table_name].append((rs.getInt("ORDINAL_POSITION"), {
+            "name": _jstr(rs.getString("COLUMN_NAME")),
+            "type_name": _jstr(rs.getString("TYPE_NAME")) or "",
+            "size": rs.getInt("COLUMN_SIZE") if rs.getInt("DATA_TYPE") in _JDBC_CHAR_TYPES else None,
+            "nullable": _jstr(rs.getString("IS_NULLABLE")) == "YES",
+        }))
+
+    described = {}
+    # Keys are looked up per table: getPrimaryKeys and getImportedKeys take
+    # a table name, not a pattern, so they have no "every table" form.
+    for table_name, cols in cols_by_table.items():
+        pk_cols = [
+            col for _, col in sorted(
+                (rs.getInt("KEY_SEQ"), _jstr(rs.getString("COLUMN_NAME")))
+                for rs in _iter_result_set(md.getPrimaryKeys(None, "PUBLIC", spelled[table_name]))
+                if _jstr(rs.getString("TABLE_NAME")).upper() == table_name
+            )
+        ]
+        fk_rows = [
+            (
+                _jstr(rs.getString("FK_NAME")),
+                _jstr(rs.getString("FKCOLUMN_NAME")),
+                rs.getInt("KEY_SEQ"),
+                _jstr(rs.getString("PKTABLE_NAME")),
+                _jstr(rs.getString("PKCOLUMN_NAME")),
+                _JDBC_FK_RULES.get(rs.getInt("UPDATE_RULE"), "NO ACTION"),
+                _JDBC_FK_RULES.get(rs.getInt("DELETE_RULE"), "NO ACTION"),
+            )
+            for rs in _iter_result_set(md.getImportedKeys(None, "PUBLIC", spelled[table_name]))
+            if _jstr(rs.getString("FKTABLE_NAME")).upper() == table_name
+        ]
+        described[table_name] = (
+            [c for _, c in sorted(cols, key=lambda pair: pair[0])],
+            pk_cols,
+            _access_fks(fk_rows),
+        )
+    return described
+
+
+@_cached_schema(_access_cache_key)
+def describe_access(connection, table):
+    jconn = getattr(connection, "jconn", None)
+    if jconn is not None:
+        described = _describe_access_jdbc(jconn, table)
+    else:
+        described = _describe_access_rows(connection, table)
+    return described.get(table.upper(), ([], [], []))
+
+
+def describe_access_all(connection, path=None) -> dict[str, tuple]:
+    """
+    Describe every Access table, through the same JDBC metadata calls as
+    describe_access on UCanAccess or one pass over the catalog views on
+    pyodbc, so both produce identical descriptors.
+
+    Returns {TABLE_NAME: (cols, pk_cols, fks)} and primes the describe_access
+    cache so later per-table lookups don't hit the catalog again. Pass the
+    .accdb `path` so pyodbc connections can prime it too.
+    """
+    jconn = getattr(connection, "jconn", None)
+    if jconn is not None:
+        described = _describe_access_jdbc(jconn)
+    else:
+        described = _describe_access_rows(connection)
+    key = _access_cache_key(connection, "", path)
+    if key is not None:
+        path, _, version = key
+        for name, descriptor in described.items():
+            _SCHEMA_CACHE[(path, name)] = (version, copy.deepcopy(descriptor))
+    return described
 
 
 def describe_sqlite(connection, table):
@@ -109,15 +294,16 @@ def describe_sqlite(connection, table):
         return '"' + name.replace('"', '""') + '"'
 
     # Allow optional "schema.table" (e.g., "main.People")
+    # The schema qualifies the PRAGMA itself: PRAGMA main.table_info("People")
     if "." in table:
         schema, tbl = table.split(".", 1)
-        target = f"{schema}.{qident(tbl)}"
+        pragma = f"{qident(schema)}."
         table_name = tbl
     else:
-        target = qident(table)
+        pragma = ""
         table_name = table
 
-    cur.execute(f"PRAGMA table_info({target});")
+    cur.execute(f"PRAGMA {pragma}table_info({qident(table_name)});")
     rows = cur.fetchall()
     def _size(dtype):
         m = re.search(r"\((\d+)\)", dtype or "")
@@ -132,8 +318,7 @@ def describe_sqlite(connection, table):
         for r in rows
     ]
     pk_cols = [r["name"] for r in sorted(rows, key=lambda r: r["pk"]) if r["pk"]]
-    qtable = '"' + table_name.replace('"','""') + '"'
-    cur.execute(f"PRAGMA foreign_key_list({qtable});")
+    cur.execute(f"PRAGMA {pragma}foreign_key_list({qident(table_name)});")
     fk_rows = cur.fetchall()
     fks_by_id = {}
     for r in fk_rows:
@@ -161,6 +346,8 @@ def describe_sqlite(connection, table):
 
 if __name__ == "__main__":
     import argparse
+    from ..logging_setup import setup as setup_logging
+    setup_logging()
     parser = argparse.ArgumentParser(description="Example script using argparse")
     parser.add_argument("accdb", help="Path to Microsoft Access database")
     parser.add_argument("sqlite", nargs="?", help="Path to SQLite database (optional)")
@@ -169,7 +356,7 @@ if __name__ == "__main__":
     if args.sqlite is None:
         base, _ = os.path.splitext(args.accdb)
         args.sqlite = base + ".sqlite"
-        logger.info(f"SQLite Database: {args.sqlite}")
+        logger.info("SQLite Database: %s", args.sqlite)
 
     from .connect_access import connection as access_connection
     with access_connection(args.accdb) as conn:
@@ -4,6 +4,7 @@ import argparse
 import logging
 
 from .utils import print_table
+from ..logging_setup import setup as setup_logging
 
 
 logger = logging.getLogger(__name__)
@@ -44,10 +45,7 @@ def parse_args() -> argparse.Namespace:
 def main():
     args = parse_args()
     level = getattr(logging, args.log_level.upper(), logging.INFO)
-    logging.basicConfig(
-        format="%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s",
-        level=level,
-    )
+    setup_logging(level)
     vertical = not args.horizontal
     orientation = "vertical" if vertical else "horizontal"
     logger.info(
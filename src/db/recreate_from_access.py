@@ -1,174 +1,492 @@
 #!/usr/bin/env python3
+import re
+import datetime
 import logging
+import functools
+import math
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from itertools import chain, islice, repeat
+from operator import itemgetter
 from typing import List, Dict, Tuple
 
-from .connect_access import connection as access_connection
-from .connect_sqlite import connection as sqlite_connection
+from .connect_access import connection as access_connection, connect_turbodbc, executemany_batched
+from .connect_sqlite import (
+    connection as sqlite_connection,
+    transaction as sqlite_transaction,
+    bulk_load as sqlite_bulk_load,
+)
+from ..logging_setup import setup as setup_logging
+from .describe import describe_access, describe_sqlite
 from .utils import (
     list_tables,
     describe_table,
     access_to_sqlite_type,
+    access_param_coercer,
     is_access_binary_type,
+    single_int_pk,
     qident,
     table_exists,
-    same_columns,
+    _access_version,
 )
 
 logger = logging.getLogger(__name__)
 
 PK_SUGGESTION_MAX_COLUMNS = 3
+CHUNK_CELL_BUDGET = 500_000
+# Tables smaller than this are not worth splitting across parallel readers
+PARTITION_MIN_ROWS = 1_000_000
+
+# Primary key evaluations keyed by (database path, table, columns), each
+# stored with the file mtime it was measured at. Every evaluation scans the
+# whole table, and resolving a key interactively revisits the same
+# candidates; any write to the .accdb invalidates the entries.
+_PK_EVAL_CACHE: dict[tuple[str, str, tuple[str, ...]], tuple[int, Dict[str, object]]] = {}
+
+
+def _pk_eval_lookup(accdb_path: str, table: str, columns: List[str]) -> Dict[str, object] | None:
+    path, mtime = _access_version(accdb_path)
+    hit = _PK_EVAL_CACHE.get((path, table, tuple(columns)))
+    if hit is None or hit[0] != mtime:
+        return None
+    return {**hit[1], "columns": list(columns)}
+
+
+def _pk_eval_store(accdb_path: str, table: str, result: Dict[str, object]) -> None:
+    path, mtime = _access_version(accdb_path)
+    _PK_EVAL_CACHE[(path, table, tuple(result["columns"]))] = (mtime, dict(result))
+
+
+def _pk_stats_sql(table_ident: str, col_exprs: List[str], prefix: str = "") -> str:
+    """
+    One-row query returning (null rows, duplicate groups, duplicate rows)
+    for the key `col_exprs`, from a single grouped pass over the table: each
+    group knows its size and how many of its rows have a NULL key column.
+    NULL keys form groups too, as in a plain GROUP BY. IIF works on both Jet
+    and UCanAccess, CASE only on the latter.
+    """
+    null_predicate = " OR ".join(f"{expr} IS NULL" for expr in col_exprs)
+    return (
+        f"SELECT {prefix}SUM(g.nulls) AS null_rows,"
+        " SUM(IIF(g.cnt > 1, 1, 0)) AS dup_groups,"
+        " SUM(IIF(g.cnt > 1, g.cnt - 1, 0)) AS dup_rows FROM ("
+        f" SELECT COUNT(*) AS cnt, SUM(IIF({null_predicate}, 1, 0)) AS nulls FROM {table_ident}"
+        f" GROUP BY {', '.join(col_exprs)}"
+        ") g"
+    )
 
 
-def evaluate_primary_key(accdb_path: str, table: str, columns: List[str]) -> Dict[str, object]:
+def evaluate_primary_key(accdb_path: str, table: str, columns: List[str], cur=None) -> Dict[str, object]:
     """
     Check whether `columns` form a valid primary key in the Access table.
     Returns metrics describing null rows, duplicate groups, duplicate row count, and validity.
+    Pass an open Access cursor as `cur` to reuse its connection. Results are
+    cached until the database file changes.
     """
     if not columns:
         raise ValueError("At least one column is required to evaluate a primary key candidate.")
 
-    with access_connection(accdb_path) as con:
-        cur = con.cursor()
-        table_ident = qident(table, "access")
-        col_exprs = [qident(col, "access") for col in columns]
+    cached = _pk_eval_lookup(accdb_path, table, columns)
+    if cached is not None:
+        return cached
+    if cur is None:
+        with access_connection(accdb_path) as con:
+            return evaluate_primary_key(accdb_path, table, columns, cur=con.cursor())
 
-        null_rows = 0
-        null_predicate = " OR ".join(f"{expr} IS NULL" for expr in col_exprs)
-        if null_predicate:
-            cur.execute(f"SELECT COUNT(*) FROM {table_ident} WHERE {null_predicate}")
-            null_rows = cur.fetchone()[0] or 0
+    table_ident = qident(table, "access")
+    col_exprs = [qident(col, "access") for col in columns]
 
-        cur.execute(
-            "SELECT COUNT(*) AS group_count, SUM(dup_counts.cnt - 1) AS dup_rows FROM ("
-            f" SELECT COUNT(*) AS cnt FROM {table_ident}"
-            f" GROUP BY {', '.join(col_exprs)}"
-            " HAVING COUNT(*) > 1"
-            ") dup_counts"
-        )
-        result = cur.fetchone()
-        duplicate_groups = (result[0] or 0) if result is not None else 0
-        duplicate_rows = (result[1] or 0) if result is not None else 0
+    cur.execute(_pk_stats_sql(table_ident, col_exprs))
+    null_rows, duplicate_groups, duplicate_rows = (v or 0 for v in cur.fetchone())
 
-    return {
-        "columns": columns,
+    result = {
+        "columns": list(columns),
         "null_rows": null_rows,
         "duplicate_groups": duplicate_groups,
         "duplicate_rows": duplicate_rows,
         "is_valid": null_rows == 0 and duplicate_groups == 0,
     }
+    _pk_eval_store(accdb_path, table, result)
+    return result
 
 
 def suggest_primary_keys(accdb_path: str, table: str, max_columns: int = PK_SUGGESTION_MAX_COLUMNS) -> List[Dict[str, object]]:
     """
     Evaluate potential primary keys by testing the first `max_columns` columns in order.
-    Returns a list of evaluation dicts (one per attempt) for review.
+    Returns a list of evaluation dicts (one per attempt) for review, shaped like
+    evaluate_primary_key's result. All prefixes are measured with one
+    statement, and the results share evaluate_primary_key's cache.
     """
-    cols, _, _ = describe_table(accdb_path, table, verbose=False)
-    ordered = [c["name"] for c in cols]
-    max_len = min(max_columns, len(ordered))
+    with access_connection(accdb_path) as con:
+        cols, _, _ = describe_access(con, table, path=accdb_path)
+        ordered = [c["name"] for c in cols]
+        max_len = min(max_columns, len(ordered))
+
+        if max_len == 0:
+            return []
+        cached = [_pk_eval_lookup(accdb_path, table, ordered[:n]) for n in range(1, max_len + 1)]
+        if all(cached):
+            return cached
+        cur = con.cursor()
+        table_ident = qident(table, "access")
+        col_exprs = [qident(col, "access") for col in ordered[:max_len]]
+
+        # Every prefix's statistics in one statement, one grouped pass each
+        cur.execute(" UNION ALL ".join(
+            _pk_stats_sql(table_ident, col_exprs[:n], f"{n} AS prefix_len, ")
+            for n in range(1, max_len + 1)
+        ))
+        stats = {int(r[0]): tuple(v or 0 for v in r[1:]) for r in cur.fetchall()}
 
     attempts: List[Dict[str, object]] = []
-    for length in range(1, max_len + 1):
-        candidate = ordered[:length]
-        result = evaluate_primary_key(accdb_path, table, candidate)
-        attempts.append(result)
+    for n in range(1, max_len + 1):
+        null_rows, duplicate_groups, duplicate_rows = stats.get(n, (0, 0, 0))
+        attempt = {
+            "columns": ordered[:n],
+            "null_rows": null_rows,
+            "duplicate_groups": duplicate_groups,
+            "duplicate_rows": duplicate_rows,
+            "is_valid": null_rows == 0 and duplicate_groups == 0,
+        }
+        _pk_eval_store(accdb_path, table, attempt)
+        attempts.append(attempt)
     return attempts
 
 
+def _sqlite_column_def(table: str, col: Dict, sqlite_type: str, rowid_pk: bool) -> str:
+    name = qident(col["name"])
+    if rowid_pk:
+        return f"{name} INTEGER PRIMARY KEY"
+    required = not col.get("nullable", True)
+    if required and is_access_binary_type(col.get("type_name")):
+        logger.warning(
+            "%s.%s: relaxing NOT NULL constraint for binary column so values can be dropped",
+            table,
+            col["name"],
+        )
+        required = False
+    return f"{name} {sqlite_type} NOT NULL" if required else f"{name} {sqlite_type}"
+
+
+def _sqlite_fk_def(fk: Dict) -> str:
+    cols = ", ".join(map(qident, fk["columns"]))
+    ref_cols = ", ".join(map(qident, fk["ref_columns"]))
+    on_upd = fk.get("update_rule")
+    on_del = fk.get("delete_rule")
+    upd = f" ON UPDATE {on_upd}" if on_upd and on_upd.upper() != "NO ACTION" else ""
+    dele = f" ON DELETE {on_del}" if on_del and on_del.upper() != "NO ACTION" else ""
+    return f"FOREIGN KEY ({cols}) REFERENCES {qident(fk['ref_table'])} ({ref_cols}){upd}{dele}"
+
+
 def build_sqlite_create(table: str,
                         acc_cols: List[Dict],
                         pk_cols: List[str],
                         fks: List[Dict]) -> str:
-    # columns
-    defs = []
+    # Resolve every column's SQLite type once
+    resolved = [access_to_sqlite_type(c["type_name"]) for c in acc_cols]
+    pk_set = set(pk_cols)
     # Prefer INTEGER PRIMARY KEY for single integer PK (rowid)
-    single_int_pk = len(pk_cols) == 1 and access_to_sqlite_type(
-        next(c for c in acc_cols if c["name"] == pk_cols[0])["type_name"]
-    ) == "INTEGER"
-    for c in acc_cols:
-        name = qident(c["name"])
-        t = access_to_sqlite_type(c["type_name"])
-        is_binary = is_access_binary_type(c.get("type_name"))
-        if single_int_pk and c["name"] == pk_cols[0]:
-            defs.append(f"{name} INTEGER PRIMARY KEY")
-        else:
-            required = not c.get("nullable", True)
-            if required and is_binary:
-                logger.warning(
-                    "%s.%s: relaxing NOT NULL constraint for binary column so values can be dropped",
-                    table,
-                    c["name"],
-                )
-            nn = " NOT NULL" if required and not is_binary else ""
-            defs.append(f"{name} {t}{nn}")
+    rowid_pk = single_int_pk(acc_cols, pk_cols)
+    # columns
+    defs = [
+        _sqlite_column_def(table, c, t, rowid_pk and c["name"] in pk_set)
+        for c, t in zip(acc_cols, resolved)
+    ]
     # composite PK
-    if pk_cols and not single_int_pk:
-        defs.append("PRIMARY KEY (" + ", ".join(qident(c) for c in pk_cols) + ")")
+    if pk_cols and not rowid_pk:
+        defs.append("PRIMARY KEY (" + ", ".join(map(qident, pk_cols)) + ")")
     # FKs
-    for fk in fks:
-        cols = ", ".join(qident(c) for c in fk["columns"])
-        ref_cols = ", ".join(qident(c) for c in fk["ref_columns"])
-        on_upd = fk.get("update_rule")
-        on_del = fk.get("delete_rule")
-        upd = f" ON UPDATE {on_upd}" if on_upd and on_upd.upper() != "NO ACTION" else ""
-        dele = f" ON DELETE {on_del}" if on_del and on_del.upper() != "NO ACTION" else ""
-        defs.append(f"FOREIGN KEY ({cols}) REFERENCES {qident(fk['ref_table'])} ({ref_cols}){upd}{dele}")
+    defs += [_sqlite_fk_def(fk) for fk in fks]
     return f"CREATE TABLE {qident(table)} (\n  " + ",\n  ".join(defs) + "\n)"
 
+def build_sqlite_fk_indexes(table: str, pk_cols: List[str], fks: List[Dict]) -> List[str]:
+    """
+    CREATE INDEX statements for every foreign key of `table`. SQLite doesn't
+    index FK columns on its own; keys already covered by the leading primary
+    key columns are skipped.
+    """
+    statements = []
+    for fk in fks:
+        cols = fk["columns"]
+        if cols == pk_cols[:len(cols)]:
+            continue
+        index_name = qident(f"idx_{table}_{'_'.join(cols)}")
+        col_list = ", ".join(qident(c) for c in cols)
+        statements.append(f"CREATE INDEX IF NOT EXISTS {index_name} ON {qident(table)} ({col_list})")
+    return statements
+
+def _reuse_or_open(con, open_connection, path, **kwargs):
+    """Context yielding `con` as-is when given, else a fresh connection to `path`."""
+    return nullcontext(con) if con is not None else open_connection(path, **kwargs)
+
+
 def create_single_table(accdb_path: str,
                         sqlite_path: str,
                         table: str,
                         overwrite: bool = False,
                         preview: bool = True,
-                        pk_override: List[str] | None = None):
-    cols, pk_cols, fks = describe_table(accdb_path, table)
+                        pk_override: List[str] | None = None,
+                        descriptor: Tuple[List[Dict], List[str], List[Dict]] | None = None,
+                        exists: bool | None = None,
+                        *,
+                        sqlite_con=None):
+    """
+    Recreate an Access table's schema in SQLite. Pass `descriptor` (one entry
+    of describe_access_all) to skip describing the Access table again,
+    `exists` (e.g. from list_sqlite_objects) to skip the existence query, and
+    an open `sqlite_con` to reuse the caller's connection.
+    """
+    if exists is None:
+        exists = table_exists(sqlite_path, table)
+    if exists and not overwrite:
+        # Nothing to do, so don't pay for describing the Access table either
+        logger.warning("SQLite table %s already exists. Skipping (use overwrite=True to drop).", table)
+        return
+    cols, pk_cols, fks = descriptor if descriptor is not None else describe_table(accdb_path, table)
     if pk_override:
         pk_cols = pk_override
     if not cols:
-        logger.warning(f"{table}: no columns found; skipping")
+        logger.warning("%s: no columns found; skipping", table)
         return
     ddl = build_sqlite_create(table, cols, pk_cols, fks)
     if preview:
-        logger.info(f"\n-- {table}")
+        logger.info("\n-- %s", table)
         logger.info(ddl)
-    with sqlite_connection(sqlite_path) as con:
+    with _reuse_or_open(sqlite_con, sqlite_connection, sqlite_path) as con:
         cur = con.cursor()
-        if table_exists(sqlite_path, table):
-            if not overwrite:
-                logger.warn(f"SQLite table {table} already exists. Skipping (use overwrite=True to drop).")
-                return
-            cur.execute(f"DROP TABLE IF EXISTS {qident(table)}")
-            con.commit()
-        cur.execute(ddl)
-        con.commit()
-        logger.info(f"Created SQLite table {table}")
-    assert same_columns(accdb_path, sqlite_path, table), "Columns do not match"
+        with sqlite_transaction(con):
+            if exists:
+                cur.execute(f"DROP TABLE IF EXISTS {qident(table)}")
+            cur.execute(ddl)
+            for statement in build_sqlite_fk_indexes(table, pk_cols, fks):
+                cur.execute(statement)
+        logger.info("Created SQLite table %s", table)
+        sqlite_names = [c["name"] for c in describe_sqlite(con, table)[0]]
+    assert sqlite_names == [c["name"] for c in cols], "Columns do not match"
+
+def _iter_chunks(cur, chunk_size: int):
+    """Yield lists of up to `chunk_size` rows from `cur` until it is drained."""
+    while (rows := cur.fetchmany(chunk_size)):
+        yield rows
+
+
+def _null_columns(width: int, null_idx: set[int]):
+    """
+    Return a function mapping a row to a tuple with the `null_idx` positions
+    replaced by None. The function is generated per table with every index
+    spelled out, e.g. `lambda r: (r[0], None, r[2],)`, so each row costs a
+    single tuple display with no loop or membership test. Only integer
+    positions are formatted into the source.
+    """
+    cells = ", ".join("None" if i in null_idx else f"r[{i:d}]" for i in range(width))
+    return eval(f"lambda r: ({cells},)", {"__builtins__": {}})
+
+
+def _tuple_getter(indexes: List[int]):
+    """itemgetter that always returns a tuple, even for zero or one index."""
+    if not indexes:
+        return lambda row: ()
+    if len(indexes) == 1:
+        i = indexes[0]
+        return lambda row: (row[i],)
+    return itemgetter(*indexes)
+
+@functools.lru_cache(maxsize=256)
+def _build_upsert_sql(table: str,
+                      col_names: Tuple[str, ...],
+                      pk_cols: Tuple[str, ...],
+                      n_rows: int,
+                      on_conflict: str | None = "update") -> str:
+    """
+    n-row INSERT for `table`. On PK conflicts it updates the non-PK columns
+    (`on_conflict="update"`), replaces the whole row (`"replace"`), or
+    fails (None). A load needs the full-batch and the remainder statements,
+    and reruns over the same tables hit the cache.
+    """
+    quoted = [qident(c) for c in col_names]
+    row_placeholder = "(" + ", ".join(["?"] * len(col_names)) + ")"
+    verb = "INSERT OR REPLACE" if on_conflict == "replace" else "INSERT"
+    sql = (
+        f"{verb} INTO {qident(table)} ({', '.join(quoted)}) VALUES "
+        + ", ".join([row_placeholder] * n_rows)
+    )
+    if on_conflict != "update":
+        return sql
+    pk_set = set(pk_cols)
+    updates = ", ".join(f"{q} = excluded.{q}" for c, q in zip(col_names, quoted) if c not in pk_set)
+    action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    return sql + f" ON CONFLICT({', '.join(map(qident, pk_cols))}) {action}"
+
+
+def _execute_multirow(cur, statement_for, rows, width: int) -> None:
+    """
+    Run `statement_for(n)` (an n-row VALUES statement) over `rows`, packing
+    as many rows per statement as the connection's bound-variable limit
+    allows. The limit is set when SQLite is built and can be lowered at
+    runtime, so it is read rather than inferred from the version.
+    """
+    max_variables = cur.connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    per_statement = max(1, max_variables // width)
+    rows = iter(rows)
+    # Flatten straight from the row stream; no intermediate list of rows.
+    # pyodbc Row objects are iterated as-is: they exist once fetchmany
+    # returns, so copying them into tuples first would only add allocations.
+    while (params := list(chain.from_iterable(islice(rows, per_statement)))):
+        cur.execute(statement_for(len(params) // width), params)
+
+
+def _check_foreign_keys(cur, table: str) -> None:
+    """Raise ValueError if rows of `table` reference missing parent rows."""
+    cur.execute(f"PRAGMA foreign_key_check({qident(table)})")
+    violations = cur.fetchall()
+    if violations:
+        _, rowid, parent, _ = violations[0]
+        raise ValueError(
+            f"{table}: {len(violations)} row(s) violate foreign keys "
+            f"(first: rowid {rowid} has no matching row in {parent})"
+        )
+
+
+def _drop_indexes(cur, table: str) -> List[str]:
+    """
+    Drop the explicitly created indexes of `table` and return their DDL so
+    they can be rebuilt. Indexes backing PRIMARY KEY/UNIQUE constraints have
+    no SQL and are left in place.
+    """
+    cur.execute(
+        "SELECT name, sql FROM sqlite_schema WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        [table],
+    )
+    indexes = cur.fetchall()
+    for name, _ in indexes:
+        cur.execute(f"DROP INDEX {qident(name)}")
+    return [sql for _, sql in indexes]
+
+
+def _load_chunks(sqlite_con,
+                 table: str,
+                 col_names: Tuple[str, ...],
+                 pk_cols: Tuple[str, ...],
+                 chunks,
+                 write_lock: AbstractContextManager | None = None,
+                 rowid_pk: bool = False,
+                 analyze: bool = True) -> None:
+    """
+    Upsert `chunks` (an iterable of row iterables) into the SQLite `table`,
+    then refresh its planner statistics. Without a `write_lock` everything
+    goes in one transaction, with indexes rebuilt and foreign keys checked
+    once at the end; with one, each chunk is committed separately while
+    holding the lock. Pass `analyze=False` when several calls load the same
+    table and statistics are refreshed once afterwards.
+
+    Pass `rowid_pk` when the key is an INTEGER PRIMARY KEY: the lock-free
+    load then uses INSERT OR REPLACE, which takes SQLite's rowid fast path.
+    REPLACE deletes the old row before inserting, so DELETE triggers fire
+    when recursive_triggers is on; leave `rowid_pk` unset for tables with
+    triggers. It is never used while foreign keys are enforced, where the
+    delete could cascade into child tables.
+    """
+    width = len(col_names)
+    cur = sqlite_con.cursor()
+    if cur.execute(f"SELECT 1 FROM {qident(table)} LIMIT 1").fetchone() is None:
+        # A freshly created table has nothing to conflict with, so skip the
+        # per-row PK probe and insert plainly.
+        on_conflict = None
+        logger.info("%s: SQLite table is empty; using plain INSERT", table)
+    elif rowid_pk and write_lock is None:
+        on_conflict = "replace"
+    else:
+        on_conflict = "update"
+
+    def upsert_sql(n_rows: int) -> str:
+        return _build_upsert_sql(table, col_names, pk_cols, n_rows, on_conflict)
+
+    if write_lock is None:
+        # Nobody else writes to the file, so load with foreign keys off and
+        # the table's secondary indexes dropped, then rebuild the indexes
+        # once and validate every reference in a single pass, all inside
+        # one transaction.
+        with sqlite_bulk_load(sqlite_con, foreign_keys=False), \
+                sqlite_transaction(sqlite_con, "IMMEDIATE"):
+            index_ddl = _drop_indexes(cur, table)
+            # Drain the source lazily; only the current chunk is ever held
+            # in memory.
+            _execute_multirow(cur, upsert_sql, chain.from_iterable(chunks), width)
+            for statement in index_ddl:
+                cur.execute(statement)
+            _check_foreign_keys(cur, table)
+    else:
+        with sqlite_bulk_load(sqlite_con):
+            for rows in chunks:
+                with write_lock:
+                    _commit_chunk(sqlite_con, cur, table, upsert_sql, rows, width)
+    if analyze:
+        _analyze(sqlite_con, table, write_lock)
+
+
+def _commit_chunk(sqlite_con, cur, table: str, upsert_sql, rows, width: int) -> None:
+    """
+    Upsert one chunk in its own transaction, with foreign keys checked at
+    COMMIT. A full foreign_key_check per chunk would rescan the table, so it
+    only runs when COMMIT fails, to raise the same ValueError as the
+    single-transaction load; a failed COMMIT leaves the rows in place to
+    report.
+    """
+    sqlite_con.executescript("BEGIN IMMEDIATE;\nPRAGMA defer_foreign_keys=ON;")
+    try:
+        _execute_multirow(cur, upsert_sql, rows, width)
+        try:
+            sqlite_con.execute("COMMIT")
+        except sqlite3.IntegrityError:
+            _check_foreign_keys(cur, table)
+            raise
+    except BaseException:
+        if sqlite_con.in_transaction:
+            sqlite_con.execute("ROLLBACK")
+        raise
+
+
+def _analyze(sqlite_con, table: str, write_lock: AbstractContextManager | None = None) -> None:
+    # Refresh sqlite_stat1 so the planner knows the new row counts
+    with write_lock or nullcontext():
+        sqlite_con.execute(f"ANALYZE {qident(table)}")
+
 
 def sync_access_to_sqlite(accdb_path: str,
                           sqlite_path: str,
                           table: str,
-                          chunk_size: int = 1000,
-                          pk_override: List[str] | None = None):
-    cols, pk_cols, _ = describe_table(accdb_path, table, verbose=False)
+                          chunk_size: int = 10_000,
+                          pk_override: List[str] | None = None,
+                          *,
+                          cols: List[Dict] | None = None,
+                          pk_cols: List[str] | None = None,
+                          write_lock: AbstractContextManager | None = None,
+                          acc_con=None,
+                          sqlite_con=None,
+                          partitions: int = 1):
+    """
+    Upsert every row of the Access table into its SQLite copy. Callers that
+    already described the table can pass `cols`/`pk_cols` to skip doing so
+    again. When several tables load into the same SQLite file concurrently,
+    pass a shared `write_lock`: rows are then fetched from Access without
+    it and written one committed chunk at a time while holding it. Open
+    `acc_con`/`sqlite_con` connections are reused instead of opening new
+    ones.
+
+    With `partitions` > 1, a table keyed by a single integer column and
+    holding at least PARTITION_MIN_ROWS rows is split into that many key
+    ranges, each read from Access by its own thread and connection.
+    """
+    if cols is None:
+        cols, pk_cols, _ = describe_table(accdb_path, table, verbose=False)
     if pk_override:
         pk_cols = pk_override
     if not pk_cols:
         raise ValueError(f"{table}: cannot sync without a primary key")
-    col_names = [c["name"] for c in cols]
-    placeholders = ", ".join(["?"] * len(col_names))
+    col_names = tuple(c["name"] for c in cols)
     quoted_cols = ", ".join(qident(c, "access") for c in col_names)
-    # UPSERT clause (update all non-PK columns)
-    upsert_clause = ", ".join(
-        f"{qident(c, 'access')} = excluded.{qident(c, 'access')}"
-        for c in col_names if c not in pk_cols
-    )
-    conflict_cols = ", ".join(qident(c, 'access') for c in pk_cols)
-    sql = f"""
-        INSERT INTO {qident(table)} ({quoted_cols})
-        VALUES ({placeholders})
-        ON CONFLICT({conflict_cols}) DO UPDATE SET
-          {upsert_clause}
-    """
     binary_idx_set = {
         i for i, c in enumerate(cols)
         if is_access_binary_type(c.get("type_name"))
@@ -178,27 +496,251 @@ def sync_access_to_sqlite(accdb_path: str,
             "Binary columns will be stored as NULLs in SQLite: %s",
             [cols[i]["name"] for i in binary_idx_set],
         )
+        scrub = _null_columns(len(cols), binary_idx_set)
+    # Bound the cells held per fetch so wide tables don't balloon memory; the
+    # 1000-row floor only limits the cap, never a smaller requested size
+    chunk_size = min(chunk_size, max(1000, CHUNK_CELL_BUDGET // max(1, len(col_names))))
+    logger.info("%s: fetching %d rows per chunk", table, chunk_size)
 
-    with access_connection(accdb_path) as acc_con, sqlite_connection(sqlite_path) as sqlite_con:
+    with _reuse_or_open(acc_con, access_connection, accdb_path) as acc_con, \
+            _reuse_or_open(sqlite_con, sqlite_connection, sqlite_path, optimize=True) as sqlite_con:
         acc_cur = acc_con.cursor()
-        sqlite_cur = sqlite_con.cursor()
-        acc_cur.execute(f"SELECT {quoted_cols} FROM {qident(table, 'access')}")
-        while (rows := acc_cur.fetchmany(chunk_size)):
-            if binary_idx_set:
-                rows = [
-                    tuple(None if idx in binary_idx_set else value for idx, value in enumerate(row))
-                    for row in rows
+        acc_cur.arraysize = chunk_size
+        select_sql = f"SELECT {quoted_cols} FROM {qident(table, 'access')}"
+        rowid_pk = single_int_pk(cols, pk_cols)
+        ranges = _pk_ranges(acc_cur, table, pk_cols[0], partitions) if partitions > 1 and rowid_pk else None
+        if ranges:
+            logger.info("%s: loading %d key ranges in parallel", table, len(ranges))
+            # Writers to one SQLite file take turns anyway; the lock makes
+            # them queue instead of failing with SQLITE_BUSY.
+            write_lock = write_lock or threading.Lock()
+            where = f" WHERE {qident(pk_cols[0], 'access')} BETWEEN ? AND ?"
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [
+                    pool.submit(_load_range, accdb_path, sqlite_path, table, select_sql + where, bounds,
+                                chunk_size, scrub if binary_idx_set else None,
+                                col_names, tuple(pk_cols), write_lock)
+                    for bounds in ranges
                 ]
-            sqlite_cur.executemany(sql, rows)
-        sqlite_con.commit()
-    logger.info(f"Synchronized table {table}")
+                for future in futures:
+                    future.result()
+            _analyze(sqlite_con, table, write_lock)
+        else:
+            acc_cur.execute(select_sql)
+            chunks = _iter_chunks(acc_cur, chunk_size)
+            if binary_idx_set:
+                chunks = (map(scrub, rows) for rows in chunks)
+            _load_chunks(sqlite_con, table, col_names, tuple(pk_cols), chunks, write_lock,
+                         rowid_pk=rowid_pk)
+    logger.info("Synchronized table %s", table)
+
+
+def _pk_ranges(cur, table: str, pk: str, partitions: int) -> List[Tuple[int, int]] | None:
+    """
+    Split the integer key `pk` of `table` into up to `partitions` inclusive
+    ranges of equal width, or return None when the table is too small to
+    be worth it. Equal widths keep this to one MIN/MAX/COUNT query; keys
+    with large gaps give uneven ranges.
+    """
+    col = qident(pk, "access")
+    cur.execute(f"SELECT MIN({col}), MAX({col}), COUNT(*) FROM {qident(table, 'access')}")
+    low, high, count = cur.fetchone()
+    if not count or count < PARTITION_MIN_ROWS:
+        return None
+    low, high = int(low), int(high)
+    step = math.ceil((high - low + 1) / partitions)
+    return [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]
+
+
+def _load_range(accdb_path: str,
+                sqlite_path: str,
+                table: str,
+                select_sql: str,
+                bounds: Tuple[int, int],
+                chunk_size: int,
+                scrub,
+                col_names: Tuple[str, ...],
+                pk_cols: Tuple[str, ...],
+                write_lock: AbstractContextManager) -> None:
+    """Load the rows of one key range on this thread's own connections."""
+    with access_connection(accdb_path) as acc_con, sqlite_connection(sqlite_path) as sqlite_con:
+        acc_cur = acc_con.cursor()
+        acc_cur.arraysize = chunk_size
+        acc_cur.execute(select_sql, list(bounds))
+        chunks = _iter_chunks(acc_cur, chunk_size)
+        if scrub is not None:
+            chunks = (map(scrub, rows) for rows in chunks)
+        _load_chunks(sqlite_con, table, col_names, pk_cols, chunks, write_lock, analyze=False)
+
+def _arrow_rows(batch, null_idx: set[int]):
+    """
+    Turn an Arrow table into row tuples, converting column by column and
+    substituting NULLs for the `null_idx` columns without reading them.
+    """
+    columns = [
+        repeat(None, batch.num_rows) if i in null_idx else column.to_pylist()
+        for i, column in enumerate(batch.columns)
+    ]
+    return zip(*columns)
+
+
+def sync_access_to_sqlite_arrow(accdb_path: str,
+                                sqlite_path: str,
+                                table: str,
+                                chunk_size: int = 10_000,
+                                pk_override: List[str] | None = None,
+                                *,
+                                cols: List[Dict] | None = None,
+                                pk_cols: List[str] | None = None,
+                                write_lock: AbstractContextManager | None = None,
+                                sqlite_con=None):
+    """
+    Same as sync_access_to_sqlite, but read Access through turbodbc, which
+    fills columnar Arrow batches in the driver instead of building one
+    Python row object per record. Needs turbodbc and pyarrow.
+    """
+    if cols is None:
+        cols, pk_cols, _ = describe_table(accdb_path, table, verbose=False)
+    if pk_override:
+        pk_cols = pk_override
+    if not pk_cols:
+        raise ValueError(f"{table}: cannot sync without a primary key")
+    col_names = tuple(c["name"] for c in cols)
+    quoted_cols = ", ".join(qident(c, "access") for c in col_names)
+    binary_idx_set = {
+        i for i, c in enumerate(cols)
+        if is_access_binary_type(c.get("type_name"))
+    }
+    if binary_idx_set:
+        logger.info(
+            "Binary columns will be stored as NULLs in SQLite: %s",
+            [cols[i]["name"] for i in binary_idx_set],
+        )
+    chunk_size = min(chunk_size, max(1000, CHUNK_CELL_BUDGET // max(1, len(col_names))))
+    logger.info("%s: fetching %d rows per Arrow batch", table, chunk_size)
+
+    acc_con = connect_turbodbc(accdb_path, chunk_size)
+    try:
+        with _reuse_or_open(sqlite_con, sqlite_connection, sqlite_path, optimize=True) as sqlite_con:
+            acc_cur = acc_con.cursor()
+            acc_cur.execute(f"SELECT {quoted_cols} FROM {qident(table, 'access')}")
+            chunks = (_arrow_rows(batch, binary_idx_set) for batch in acc_cur.fetcharrowbatches())
+            _load_chunks(sqlite_con, table, col_names, tuple(pk_cols), chunks, write_lock,
+                         rowid_pk=single_int_pk(cols, pk_cols))
+    finally:
+        acc_con.close()
+    logger.info("Synchronized table %s", table)
+
+_CREATE_TABLE_RE = re.compile(r"^\s*CREATE\s+TABLE\s+(?!IF\s+NOT\s+EXISTS)", re.IGNORECASE)
+
+
+def sync_sqlite_to_sqlite(src_path: str,
+                          dst_path: str,
+                          table: str,
+                          pk_cols: List[str] | None = None,
+                          *,
+                          sqlite_con=None):
+    """
+    Upsert every row of `table` from one SQLite database into another with a
+    single INSERT ... SELECT over an attached database, so no rows pass
+    through Python. The destination table is created from the source's DDL
+    when missing. Tables without a primary key are matched on rowid, which
+    only tracks the source while it isn't VACUUMed.
+    """
+    with _reuse_or_open(sqlite_con, sqlite_connection, dst_path, optimize=True) as con:
+        cur = con.cursor()
+        cur.execute("ATTACH DATABASE ? AS src", [src_path])
+        try:
+            src_cols, src_pk, _ = describe_sqlite(con, f"src.{table}")
+            pk_cols = pk_cols or src_pk
+            if not src_cols:
+                raise ValueError(f"{table}: not found in {src_path}")
+            col_names = [c["name"] for c in src_cols]
+            quoted_cols = ", ".join(map(qident, col_names))
+            if pk_cols:
+                updates = ", ".join(
+                    f"{qident(c)} = excluded.{qident(c)}" for c in col_names if c not in pk_cols
+                )
+                action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+                # "WHERE true" keeps the parser from reading ON CONFLICT as a join constraint
+                copy_sql = (
+                    f"INSERT INTO main.{qident(table)} ({quoted_cols}) "
+                    f"SELECT {quoted_cols} FROM src.{qident(table)} WHERE true "
+                    f"ON CONFLICT({', '.join(map(qident, pk_cols))}) {action}"
+                )
+            else:
+                # A rowid can't be an upsert target, but REPLACE resolves its conflicts
+                logger.warning("%s: no primary key; matching rows by rowid", table)
+                copy_sql = (
+                    f"INSERT OR REPLACE INTO main.{qident(table)} (rowid, {quoted_cols}) "
+                    f"SELECT rowid, {quoted_cols} FROM src.{qident(table)}"
+                )
+            with sqlite_transaction(con, "IMMEDIATE", "PRAGMA defer_foreign_keys=ON;"):
+                ddl = cur.execute(
+                    "SELECT sql FROM src.sqlite_schema WHERE type = 'table' AND name = ?", [table]
+                ).fetchone()[0]
+                cur.execute(_CREATE_TABLE_RE.sub("CREATE TABLE IF NOT EXISTS ", ddl, count=1))
+                cur.execute(copy_sql)
+                _check_foreign_keys(cur, table)
+        finally:
+            cur.execute("DETACH DATABASE src")
+        cur.execute(f"ANALYZE main.{qident(table)}")
+    logger.info("Synchronized table %s (SQLite → SQLite)", table)
+
+def _key_part(value):
+    """
+    One key value as Access compares it: text case-insensitively, and dates
+    as the ISO text the SQLite copy stores (sqlite3's own "YYYY-MM-DD
+    HH:MM:SS" form).
+    """
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat(" ")
+    elif isinstance(value, datetime.date):
+        value = value.isoformat()
+    return value.casefold() if isinstance(value, str) else value
+
+
+def _key_form(key: tuple) -> tuple:
+    return tuple(map(_key_part, key))
+
+
+def _existing_keys(cur, table: str, pk_cols: List[str], keys: List[tuple], batch: int = 200) -> set:
+    """
+    Return the keys from `keys` (PK value tuples) already present in the
+    Access table, in _key_form so SQLite keys can be matched against them.
+    """
+    pk_list = ", ".join(qident(c, "access") for c in pk_cols)
+    if len(pk_cols) == 1:
+        match = f"{qident(pk_cols[0], 'access')} IN ({{}})"
+        group = "?"
+    else:
+        match = "{}"
+        group = "(" + " AND ".join(f"{qident(c, 'access')} = ?" for c in pk_cols) + ")"
+    found = set()
+    for start in range(0, len(keys), batch):
+        part = keys[start:start + batch]
+        joiner = ", " if len(pk_cols) == 1 else " OR "
+        where = match.format(joiner.join([group] * len(part)))
+        cur.execute(
+            f"SELECT {pk_list} FROM {qident(table, 'access')} WHERE {where}",
+            [v for key in part for v in key],
+        )
+        found.update(_key_form(row) for row in cur.fetchall())
+    return found
+
 
 def sync_sqlite_to_access(sqlite_path: str,
                           accdb_path: str,
                           table: str,
                           chunk_size: int = 1000,
-                          pk_override: List[str] | None = None):
-    cols, pk_cols, _ = describe_table(accdb_path, table, verbose=False)
+                          pk_override: List[str] | None = None,
+                          *,
+                          cols: List[Dict] | None = None,
+                          pk_cols: List[str] | None = None,
+                          sqlite_con=None,
+                          acc_con=None):
+    if cols is None:
+        cols, pk_cols, _ = describe_table(accdb_path, table, verbose=False)
     if pk_override:
         pk_cols = pk_override
     if not pk_cols:
@@ -210,33 +752,73 @@ def sync_sqlite_to_access(sqlite_path: str,
     set_clause = ", ".join(f"{qident(c, 'access')} = ?" for c in col_names if c not in pk_cols)
     where_clause = " AND ".join(f"{qident(c, 'access')} = ?" for c in pk_cols)
 
-    with sqlite_connection(sqlite_path) as s_con, access_connection(accdb_path) as a_con:
+    update_sql = f"UPDATE {qident(table, 'access')} SET {set_clause} WHERE {where_clause}"
+    insert_sql = f"INSERT INTO {qident(table, 'access')} ({quoted_cols}) VALUES ({placeholders})"
+    # UPDATE binds the non-PK values followed by the PK values
+    pk_set = set(pk_cols)
+    pk_get = _tuple_getter([col_names.index(c) for c in pk_cols])
+    nonpk_get = _tuple_getter([i for i, c in enumerate(col_names) if c not in pk_set])
+
+    with _reuse_or_open(sqlite_con, sqlite_connection, sqlite_path) as s_con, \
+            _reuse_or_open(acc_con, access_connection, accdb_path) as a_con:
+        # pyodbc's fast_executemany binds every row with the types of the
+        # first, so values are converted to the declared Access types. JDBC
+        # binds each value on its own and takes the SQLite values as they are.
+        coerce = access_param_coercer(cols) if getattr(a_con, "jconn", None) is None else None
         s_cur, a_cur = s_con.cursor(), a_con.cursor()
         s_cur.execute(f"SELECT {', '.join(qident(c, 'sqlite') for c in col_names)} FROM {qident(table, 'sqlite')}")
         while (rows := s_cur.fetchmany(chunk_size)):
+            if coerce is not None:
+                rows = [coerce(r) for r in rows]
+            # Batched statements don't report per-row counts reliably, so
+            # look up which keys already exist and split the chunk up front.
+            existing = _existing_keys(a_cur, table, pk_cols, [pk_get(r) for r in rows])
+            updates, inserts = [], []
             for r in rows:
-                nonpk = [r[col_names.index(c)] for c in col_names if c not in pk_cols]
-                pk = [r[col_names.index(c)] for c in pk_cols]
-                a_cur.execute(f"UPDATE {qident(table, 'access')} SET {set_clause} WHERE {where_clause}", nonpk + pk)
-                if not a_cur.rowcount:
-                    a_cur.execute(f"INSERT INTO {qident(table, 'access')} ({quoted_cols}) VALUES ({placeholders})", r)
-        a_con.commit()
-    logger.info(f"Synchronized table {table} (SQLite → Access)")
+                if _key_form(pk_get(r)) in existing:
+                    updates.append((*nonpk_get(r), *pk_get(r)))
+                else:
+                    inserts.append(tuple(r))
+            try:
+                if updates and set_clause:
+                    executemany_batched(a_con, update_sql, updates, fast_executemany=True)
+                if inserts:
+                    executemany_batched(a_con, insert_sql, inserts, fast_executemany=True)
+            except Exception:
+                # Most likely a key Access matches but _key_form doesn't
+                # (e.g. another date format), sent as an INSERT. Both drivers
+                # run in autocommit, so rows written before the failure stay
+                # written; redoing the whole chunk row by row is still safe
+                # because each row is an idempotent upsert, with the UPDATE's
+                # rowcount deciding whether to insert.
+                logger.warning("%s: batched write failed; retrying the chunk row by row", table,
+                               exc_info=logger.isEnabledFor(logging.DEBUG))
+                for r in rows:
+                    if set_clause:
+                        a_cur.execute(update_sql, (*nonpk_get(r), *pk_get(r)))
+                        if a_cur.rowcount:
+                            continue
+                    elif _existing_keys(a_cur, table, pk_cols, [pk_get(r)]):
+                        continue
+                    a_cur.execute(insert_sql, tuple(r))
+            a_con.commit()
+    logger.info("Synchronized table %s (SQLite → Access)", table)
 
 
 if __name__ == "__main__":
     import os
     import argparse
+    setup_logging()
     parser = argparse.ArgumentParser(description="Create Access table in SQLite")
     parser.add_argument("accdb", help="Path to Microsoft Access database")
     parser.add_argument("sqlite", nargs="?", help="Path to SQLite database (optional)")
     parser.add_argument("table", help="Table name")
     args = parser.parse_args()
-    logger.info(f"Access Database: {args.accdb}")
+    logger.info("Access Database: %s", args.accdb)
     # SQLite db has the same name as the Access db, but different extension
     if args.sqlite is None:
         base, _ = os.path.splitext(args.accdb)
         args.sqlite = base + ".sqlite"
-        logger.info(f"SQLite Database: {args.sqlite}")
+        logger.info("SQLite Database: %s", args.sqlite)
 
     create_single_table(args.accdb, args.sqlite, args.table, True)
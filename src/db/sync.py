@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
 import os
+import copy
 import logging
 import argparse
-import yaml
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, ExitStack, nullcontext
 
 from typing import Dict, List, Optional
 
-from .utils import list_tables, print_table, describe_table
+from ..logging_setup import setup as setup_logging
+from .connect_access import connection as access_connection
+from .connect_sqlite import connection as sqlite_connection
+from .describe import describe_access_all, describe_sqlite
+from .utils import list_tables, print_table, describe_table, list_sqlite_objects, _db_dialect
 from .recreate_from_access import (
+    build_sqlite_create,
     create_single_table,
     sync_access_to_sqlite,
+    sync_access_to_sqlite_arrow,
     sync_sqlite_to_access,
+    sync_sqlite_to_sqlite,
     evaluate_primary_key,
     suggest_primary_keys,
     PK_SUGGESTION_MAX_COLUMNS,
@@ -18,39 +29,72 @@ from .recreate_from_access import (
 
 logger = logging.getLogger(__name__)
 
-def load_pk_map(path: str) -> dict:
+# Threads loading tables of one FK level; the work is I/O bound on the
+# Access driver, and more writers only queue on the SQLite lock.
+MAX_SYNC_WORKERS = 8
+
+def _read_legacy_pk_map(path: str):
+    import yaml  # only needed to migrate maps written before the JSON format
+    try:
+        from yaml import CSafeLoader as Loader  # libyaml's C parser
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    with open(path, "r") as f:
+        return yaml.load(f.read(), Loader=Loader)
+
+def _normalize_entry(value) -> Dict[str, object]:
+    """Turn one stored map entry, in any of its accepted shapes, into {"columns", "skip"}."""
+    # Maps written by save_pk_map only hold dicts, so check that shape first
+    if isinstance(value, dict):
+        cols = value.get("columns")
+        if isinstance(cols, list) and cols:
+            columns = [str(c) for c in cols]
+        elif isinstance(cols, str) and cols:
+            columns = [cols]
+        else:
+            columns = None
+        return {"columns": columns, "skip": bool(value.get("skip"))}
+    if isinstance(value, list):
+        return {"columns": [str(c) for c in value] or None, "skip": False}
+    if isinstance(value, str):
+        value = value.strip()
+        if value.lower() == "skip":
+            return {"columns": None, "skip": True}
+        return {"columns": [value] if value else None, "skip": False}
+    if isinstance(value, bool):
+        return {"columns": None, "skip": value}
+    return {"columns": None, "skip": False}
+
+def load_pk_map(path: str, migrate_legacy: bool = True) -> dict:
+    """
+    Load the primary key map stored as JSON at `path`. When only a legacy
+    YAML map exists next to it (same name ending in .yaml), that one is read
+    and, unless `migrate_legacy` is False, immediately rewritten as JSON.
+    """
+    legacy_path = os.path.splitext(path)[0] + ".yaml"
+    migrate = False
     if os.path.exists(path):
         with open(path, "r") as f:
-            data = yaml.safe_load(f) or {}
-            if not isinstance(data, dict):
-                return {}
-            normalized: Dict[str, Dict[str, object]] = {}
-            for key, value in data.items():
-                entry: Dict[str, object] = {"columns": None, "skip": False}
-                if isinstance(value, dict):
-                    cols = value.get("columns")
-                    if isinstance(cols, list) and cols:
-                        entry["columns"] = [str(c) for c in cols]
-                    elif isinstance(cols, str) and cols:
-                        entry["columns"] = [cols]
-                    entry["skip"] = bool(value.get("skip"))
-                elif isinstance(value, list):
-                    if value:
-                        entry["columns"] = [str(c) for c in value]
-                elif isinstance(value, str):
-                    if value.strip().lower() == "skip":
-                        entry["skip"] = True
-                    elif value.strip():
-                        entry["columns"] = [value.strip()]
-                elif isinstance(value, bool):
-                    entry["skip"] = value
-                normalized[str(key).upper()] = entry
-            return normalized
-    return {}
+            data = json.load(f)
+    elif os.path.exists(legacy_path):
+        data = _read_legacy_pk_map(legacy_path)
+        migrate = migrate_legacy
+    else:
+        return {}
+    data = data or {}
+    if not isinstance(data, dict):
+        return {}
+    normalized = {str(key).upper(): _normalize_entry(value) for key, value in data.items()}
+    if migrate:
+        save_pk_map(path, normalized)
+        logger.info("Migrated primary key map %s to %s", legacy_path, path)
+    return normalized
 
 def save_pk_map(path: str, data: dict) -> None:
+    # Built in key order (and "columns" before "skip" inside each entry), so
+    # the writer doesn't have to sort
     serializable: Dict[str, object] = {}
-    for key, entry in data.items():
+    for key, entry in sorted(data.items()):
         skip = bool(entry.get("skip"))
         columns = entry.get("columns")
         payload: Dict[str, object] = {}
@@ -60,26 +104,67 @@ def save_pk_map(path: str, data: dict) -> None:
             payload["skip"] = True
         if payload:
             serializable[key] = payload
-    with open(path, "w") as f:
-        yaml.safe_dump(serializable, f, sort_keys=True)
+    _write_json(path, serializable, sort_keys=False)
+
+def _write_json(path: str, data, sort_keys: bool = True) -> None:
+    """Write `data` to a temporary file and swap it in, so readers never see a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, sort_keys=sort_keys, indent=2)
+    os.replace(tmp_path, path)
+
+def _source_stamp(accdb: str) -> Dict[str, int]:
+    st = os.stat(accdb)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+def load_plan(path: str, accdb: str) -> Optional[Dict[str, tuple]]:
+    """
+    Read table descriptors cached by save_plan, keyed like describe_access_all.
+    Returns None when there is no plan or `accdb` changed since it was written.
+    """
+    try:
+        with open(path, "r") as f:
+            plan = json.load(f)
+    except FileNotFoundError:
+        return None
+    if plan.get("source") != _source_stamp(accdb):
+        logger.info("Plan cache %s is stale; describing %s again.", path, accdb)
+        return None
+    return {
+        table: (entry["cols"], entry["pk_cols"], entry["fks"])
+        for table, entry in plan.get("tables", {}).items()
+    }
+
+def save_plan(path: str, accdb: str, schema: Dict[str, tuple]) -> None:
+    """Cache table descriptors (and the DDL they produce) for later runs."""
+    tables = {
+        table: {"ddl": build_sqlite_create(table, cols, pk_cols, fks),
+                "cols": cols, "pk_cols": pk_cols, "fks": fks}
+        for table, (cols, pk_cols, fks) in schema.items()
+    }
+    _write_json(path, {"source": _source_stamp(accdb), "tables": tables})
 
 def _normalize_columns(candidates: List[str], available: Dict[str, str]) -> List[str]:
     normalized = []
     for col in candidates:
-        key = col.strip().lower()
-        if key not in available:
+        name = available.get(col.lower())
+        if name is None:
             raise KeyError(col)
-        normalized.append(available[key])
+        normalized.append(name)
     return normalized
 
-def resolve_primary_key(accdb: str, table: str, existing_entry: Optional[Dict[str, object]]) -> tuple[List[str], bool]:
+def resolve_primary_key(accdb: str,
+                        table: str,
+                        existing_entry: Optional[Dict[str, object]],
+                        descriptor: Optional[tuple] = None) -> tuple[List[str], bool]:
     """
     Determine a usable primary key for the given Access table.
 
     Returns (columns, skip_flag) where `columns` is a list of column names when a valid
     key is identified, and `skip_flag` is True when the user opts to skip syncing the table.
+    Pass the table's `descriptor` (cols, pk, fks) when the caller already has it.
     """
-    cols_meta, _, _ = describe_table(accdb, table, verbose=False)
+    cols_meta, _, _ = descriptor if descriptor is not None else describe_table(accdb, table, verbose=False)
     available = {c["name"].lower(): c["name"] for c in cols_meta}
     existing_columns: Optional[List[str]] = None
     if existing_entry:
@@ -91,11 +176,13 @@ def resolve_primary_key(accdb: str, table: str, existing_entry: Optional[Dict[st
     def valid_or_none(columns: List[str] | None) -> List[str] | None:
         if not columns:
             return None
-        if any(col.lower() not in available for col in columns):
+        # Map to the table's spelling once; evaluations are cached per column list
+        resolved = [available.get(col.lower()) for col in columns]
+        if None in resolved:
             return None
-        result = evaluate_primary_key(accdb, table, [available[col.lower()] for col in columns])
+        result = evaluate_primary_key(accdb, table, resolved)
         if result["is_valid"]:
-            return [available[col.lower()] for col in columns]
+            return resolved
         logger.warning(
             "Stored primary key %s is invalid for %s (null rows=%s, duplicate groups=%s, duplicate rows=%s).",
             columns,
@@ -204,8 +291,127 @@ def resolve_primary_key(accdb: str, table: str, existing_entry: Optional[Dict[st
             result["duplicate_rows"],
         )
 
+def fk_levels(descriptors: Dict[str, tuple]) -> List[List[str]]:
+    """
+    Group tables so every table comes after the tables its foreign keys
+    reference. Tables in one level don't depend on each other. References
+    outside `descriptors` and self-references are ignored; tables caught in
+    a cycle end up together in the last level.
+    """
+    names = {t.upper(): t for t in descriptors}
+    deps = {
+        t: {names[fk["ref_table"].upper()] for fk in d[2]
+            if fk["ref_table"].upper() in names and names[fk["ref_table"].upper()] != t}
+        for t, d in descriptors.items()
+    }
+    levels: List[List[str]] = []
+    done: set = set()
+    while len(done) < len(deps):
+        level = [t for t in deps if t not in done and deps[t] <= done]
+        if not level:
+            level = [t for t in deps if t not in done]
+            logger.warning("Foreign key cycle among %s; syncing them together.", ", ".join(level))
+        levels.append(level)
+        done.update(level)
+    return levels
+
+class ThreadConnections:
+    """
+    One Access and one SQLite connection per thread, opened on first use and
+    all closed together when the context exits. sqlite3 connections must not
+    be shared between concurrent writers, but each worker can keep its own
+    for every table it handles.
+    """
+
+    def __init__(self, accdb: str, sqlite: str):
+        self.accdb = accdb
+        self.sqlite = sqlite
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stack = ExitStack()
+
+    def get(self) -> tuple:
+        cons = getattr(self._local, "cons", None)
+        if cons is None:
+            with self._lock:
+                cons = self._local.cons = (
+                    self._stack.enter_context(access_connection(self.accdb)),
+                    self._stack.enter_context(sqlite_connection(self.sqlite, optimize=True)),
+                )
+        return cons
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return self._stack.__exit__(*exc)
+
+def sync_sqlite_tables(src: str, dst: str, tables: Optional[List[str]] = None, dry_run: bool = False) -> None:
+    """
+    Copy `tables` (default: all) from the SQLite database `src` into `dst`,
+    parents before the tables whose foreign keys reference them. With
+    `dry_run`, only log each table's DDL in that order; `dst` is not opened.
+    """
+    tables = tables or list_tables(src)
+    with sqlite_connection(src) as con:
+        descriptors = {table: describe_sqlite(con, table) for table in tables}
+        if dry_run:
+            for level in fk_levels(descriptors):
+                for table in level:
+                    row = con.execute(
+                        "SELECT sql FROM sqlite_schema WHERE type = 'table' AND name = ?", [table]
+                    ).fetchone()
+                    logger.info("\n-- %s\n%s", table, row[0] if row else "-- not found")
+            return
+    with sqlite_connection(dst, optimize=True) as con:
+        for level in fk_levels(descriptors):
+            for table in level:
+                sync_sqlite_to_sqlite(src, dst, table, sqlite_con=con)
+
+def sync_table(accdb: str,
+               sqlite: str,
+               table: str,
+               descriptor: tuple,
+               pk_override: Optional[List[str]],
+               direction: str = "access-to-sqlite",
+               exists: Optional[bool] = None,
+               write_lock: Optional[AbstractContextManager] = None,
+               chunk_size: int = 10_000,
+               connections: Optional["ThreadConnections"] = None,
+               engine: str = "odbc",
+               partitions: int = 1) -> None:
+    """
+    Recreate (if needed) and sync one table in the requested direction.
+    `engine="arrow"` reads Access through turbodbc/pyarrow instead;
+    `partitions` > 1 reads large integer-keyed tables in parallel key ranges.
+    """
+    logger.info("Syncing %s", table)
+    acc_con, sqlite_con = connections.get() if connections is not None else (None, None)
+    try:
+        if direction == "access-to-sqlite":
+            with write_lock or nullcontext():
+                create_single_table(accdb, sqlite, table,
+                                    pk_override=pk_override, descriptor=descriptor,
+                                    exists=exists, sqlite_con=sqlite_con)
+            if engine == "arrow":
+                sync_access_to_sqlite_arrow(accdb, sqlite, table, chunk_size, pk_override=pk_override,
+                                            cols=descriptor[0], pk_cols=descriptor[1],
+                                            write_lock=write_lock, sqlite_con=sqlite_con)
+            else:
+                sync_access_to_sqlite(accdb, sqlite, table, chunk_size, pk_override=pk_override,
+                                      cols=descriptor[0], pk_cols=descriptor[1],
+                                      write_lock=write_lock, acc_con=acc_con, sqlite_con=sqlite_con,
+                                      partitions=partitions)
+        else:
+            sync_sqlite_to_access(sqlite, accdb, table, chunk_size, pk_override=pk_override,
+                                  cols=descriptor[0], pk_cols=descriptor[1],
+                                  sqlite_con=sqlite_con, acc_con=acc_con)
+    except ValueError as e:
+        raise Exception(f"Failed to sync table {table}: {e}") from e
+
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Sync Access and SQLite databases, remembering PKs in YAML")
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Sync Access and SQLite databases, remembering PKs in JSON")
     parser.add_argument("accdb", help="Path to Microsoft Access database")
     parser.add_argument("sqlite", nargs="?", help="Path to SQLite database (optional)")
     parser.add_argument("--tables", nargs="*", default=[], help="List of tables to sync.")
@@ -213,63 +419,145 @@ if __name__ == "__main__":
                         choices=("access-to-sqlite", "sqlite-to-access"),
                         default="access-to-sqlite",
                         help="Direction of synchronization. Default is Access → SQLite.")
+    parser.add_argument("--chunk-size", type=int, default=10_000,
+                        help="Rows fetched per batch (capped for wide tables). Default is 10000.")
+    parser.add_argument("--engine", choices=("odbc", "arrow"), default="odbc",
+                        help="How to read Access when loading SQLite: row by row (odbc) or as "
+                             "columnar batches through turbodbc and pyarrow (arrow, Windows only).")
+    parser.add_argument("--parallel", type=int, default=1, metavar="N",
+                        help="Read tables with a single integer key and at least 1M rows "
+                             "as N key ranges in parallel (odbc engine). Default is 1.")
+    parser.add_argument("--plan-cache", metavar="PATH",
+                        help="JSON file caching table descriptions between runs; "
+                             "refreshed whenever the Access file changes.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the SQLite DDL without syncing. Tables are still described "
+                             "(from --plan-cache when given), but keys are taken from Access or the "
+                             "PK map without checking them, and nothing is written.")
     args = parser.parse_args()
-    logger.info(f"Access Database: {args.accdb}")
+    if args.engine == "arrow" and args.direction != "access-to-sqlite":
+        parser.error("--engine arrow only applies to access-to-sqlite")
+    logger.info("Access Database: %s", args.accdb)
+
+    # SQLite source: copy each table inside SQLite without touching Access
+    if _db_dialect(args.accdb) == "sqlite":
+        if args.sqlite is None:
+            parser.error("a destination SQLite database is required when the source is SQLite")
+        if args.direction != "access-to-sqlite":
+            parser.error("--direction sqlite-to-access needs an Access database as the first argument")
+        if args.engine != "odbc" or args.plan_cache:
+            parser.error("--engine and --plan-cache only apply when reading from Access")
+        sync_sqlite_tables(args.accdb, args.sqlite, args.tables, dry_run=args.dry_run)
+        raise SystemExit(0)
 
     # SQLite db has the same name as the Access db, but different extension
     if args.sqlite is None:
         base, _ = os.path.splitext(args.accdb)
         args.sqlite = base + ".sqlite"
-        logger.info(f"SQLite Database: {args.sqlite}")
+        logger.info("SQLite Database: %s", args.sqlite)
 
     # Load or create a PK map
     base, _ = os.path.splitext(args.accdb)
-    pk_map_path = base + ".pk.yaml"
-    pk_map = load_pk_map(pk_map_path)
+    pk_map_path = base + ".pk.json"
+    pk_map = load_pk_map(pk_map_path, migrate_legacy=not args.dry_run)
+    original_pk_map = copy.deepcopy(pk_map)
 
     # Print all tables
     if not args.tables:
         args.tables = [x.upper() for x in list_tables(args.accdb)]
-    _tables = "\n" + "\n".join(args.tables)
-    logger.info(f"Tables: {_tables}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Tables:\n%s", "\n".join(args.tables))
 
-    # Sync each table
-    for table in args.tables:
-        logger.info(f"Syncing {table}")
+    # Describe every table with one catalog scan instead of one per table,
+    # or reuse the descriptors cached by a previous run
+    schema = load_plan(args.plan_cache, args.accdb) if args.plan_cache else None
+    if schema is None:
+        with access_connection(args.accdb) as con:
+            schema = describe_access_all(con, path=args.accdb)
+        if args.plan_cache and not args.dry_run:
+            save_plan(args.plan_cache, args.accdb, schema)
+    existing = list_sqlite_objects(args.sqlite) if args.direction == "access-to-sqlite" else set()
 
-        stored_entry = pk_map.get(table, {"columns": None, "skip": False})
-        if stored_entry.get("skip"):
-            logger.info("Skipping %s (marked to skip in primary key map).", table)
-            continue
+    # Resolve primary keys first; this may prompt, so it stays sequential.
+    # The map is written once at the end, or on the way out if interrupted.
+    jobs: Dict[str, tuple] = {}
+    dirty = False
+    try:
+        for table in args.tables:
+            stored_entry = pk_map.get(table, {"columns": None, "skip": False})
+            if stored_entry.get("skip"):
+                logger.info("Skipping %s (marked to skip in primary key map).", table)
+                continue
 
-        _, access_pk, _ = describe_table(args.accdb, table, verbose=False)
-        pk_override = None
+            descriptor = schema.get(table.upper())
+            if descriptor is None:
+                descriptor = describe_table(args.accdb, table, verbose=False)
+            _, access_pk, _ = descriptor
+            pk_override = None
 
-        if access_pk:
-            logger.info("Using Access-defined primary key for %s: %s", table, ", ".join(access_pk))
-            if table in pk_map:
-                pk_map.pop(table, None)
-                save_pk_map(pk_map_path, pk_map)
-        else:
-            pk_columns, skip_table = resolve_primary_key(args.accdb, table, stored_entry)
-            if skip_table:
-                pk_map[table] = {"columns": None, "skip": True}
-                save_pk_map(pk_map_path, pk_map)
-                logger.info("Skipping %s; decision recorded in PK map.", table)
-                continue
-            pk_override = pk_columns
-            pk_map[table] = {"columns": pk_override, "skip": False}
+            if access_pk:
+                logger.info("Using Access-defined primary key for %s: %s", table, ", ".join(access_pk))
+                if pk_map.pop(table, None) is not None:
+                    dirty = True
+            elif args.dry_run:
+                # No prompts or uniqueness scans; stored keys are shown as they are
+                pk_override = stored_entry.get("columns")
+                if not pk_override:
+                    logger.info("Skipping %s; no primary key chosen yet.", table)
+                    continue
+            else:
+                pk_columns, skip_table = resolve_primary_key(args.accdb, table, stored_entry, descriptor)
+                if skip_table:
+                    entry = {"columns": None, "skip": True}
+                else:
+                    pk_override = pk_columns
+                    entry = {"columns": pk_override, "skip": False}
+                if pk_map.get(table) != entry:
+                    pk_map[table] = entry
+                    dirty = True
+                if skip_table:
+                    logger.info("Skipping %s; decision recorded in PK map.", table)
+                    continue
+                logger.info("Using override primary key for %s: %s", table, ", ".join(pk_override))
+            jobs[table] = (descriptor, pk_override)
+    finally:
+        # Entries can be touched and end up as they were; only write real changes
+        if dirty and pk_map != original_pk_map and not args.dry_run:
             save_pk_map(pk_map_path, pk_map)
-            logger.info("Using override primary key for %s: %s", table, ", ".join(pk_override))
 
-        try:
-            if args.direction == "access-to-sqlite":
-                create_single_table(args.accdb, args.sqlite, table, pk_override=pk_override)
-                sync_access_to_sqlite(args.accdb, args.sqlite, table, pk_override=pk_override)
-            else:
-                sync_sqlite_to_access(args.sqlite, args.accdb, table, pk_override=pk_override)
-        except ValueError as e:
-            raise Exception(f"Failed to sync table {table}: {e}") from e
+    if args.dry_run:
+        for table, ((cols, access_pk, fks), pk_override) in jobs.items():
+            logger.info("\n-- %s\n%s", table, build_sqlite_create(table, cols, pk_override or access_pk, fks))
+        raise SystemExit(0)
 
-        if args.direction == "access-to-sqlite":
-            print_table(args.sqlite, table.upper(), subsample=10)
+    # Sync level by level so referenced tables are loaded before the tables
+    # pointing at them; tables within a level load into SQLite concurrently.
+    # Workers keep their connections for the whole run.
+    levels = fk_levels({t: d for t, (d, _) in jobs.items()})
+    parallel = args.direction == "access-to-sqlite"
+    workers = min(MAX_SYNC_WORKERS, max(map(len, levels), default=1))
+    write_lock = threading.Lock()
+    with ThreadConnections(args.accdb, args.sqlite) as connections, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        for level in levels:
+            kwargs = dict(direction=args.direction, chunk_size=args.chunk_size,
+                          connections=connections, engine=args.engine, partitions=args.parallel)
+            if parallel and len(level) > 1:
+                futures = [
+                    pool.submit(sync_table, args.accdb, args.sqlite, table, *jobs[table],
+                                exists=table in existing, write_lock=write_lock, **kwargs)
+                    for table in level
+                ]
+                for future in futures:
+                    future.result()
+            else:
+                # A single table gets the uncontended one-transaction load
+                for table in level:
+                    sync_table(args.accdb, args.sqlite, table, *jobs[table],
+                               exists=table in existing, **kwargs)
+            if parallel:
+                existing.update(level)
+                # The sample query is only worth running when it will be shown
+                if logger.isEnabledFor(logging.INFO):
+                    for table in level:
+                        print_table(args.sqlite, table.upper(), subsample=10)
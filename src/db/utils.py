@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
+import os
+import datetime
+import decimal
 import logging
-from typing import Sequence
+from typing import Callable, Sequence
 
 from .connect_access import connection as access_connection
 from .connect_sqlite import connection as sqlite_connection
@@ -8,8 +11,36 @@ from .describe import describe_access, describe_sqlite
 
 logger = logging.getLogger(__name__)
 
+# Access table lists keyed by absolute path -> (file mtime, names). A sync
+# asks for the same list several times, and each lookup otherwise queries the
+# catalog; the mtime check makes any write to the .accdb refresh the entry.
+# Table descriptions are cached the same way inside describe_access.
+_ACCESS_TABLES_CACHE: dict[str, tuple[int, list]] = {}
+
+
+_EXT_TO_DIALECT = {".accdb": "access", ".mdb": "access", ".sqlite": "sqlite", ".db": "sqlite"}
+
+
+def _db_dialect(db_path: str) -> str:
+    """'access' or 'sqlite', from the file extension of `db_path`."""
+    dialect = _EXT_TO_DIALECT.get(os.path.splitext(db_path)[1].lower())
+    if dialect is None:
+        raise ValueError("Unsupported database type; expected .accdb, .mdb, .sqlite or .db")
+    return dialect
+
+
+def _access_version(db_path: str) -> tuple[str, int]:
+    path = os.path.abspath(db_path)
+    return path, os.stat(path).st_mtime_ns
+
+
 def list_tables(db_path: str):
-    if db_path.endswith("accdb"):
+    dialect = _db_dialect(db_path)
+    if dialect == "access":
+        path, mtime = _access_version(db_path)
+        hit = _ACCESS_TABLES_CACHE.get(path)
+        if hit is not None and hit[0] == mtime:
+            return list(hit[1])
         with access_connection(db_path) as con:
             cur = con.cursor()
             cur.execute("""
@@ -19,7 +50,7 @@ def list_tables(db_path: str):
                 ORDER BY TABLE_NAME
             """)
             rows = cur.fetchall()
-    elif db_path.endswith("sqlite"):
+    else:
         with sqlite_connection(db_path) as con:
             cur = con.cursor()
             cur.execute("""
@@ -29,15 +60,17 @@ def list_tables(db_path: str):
                 ORDER BY name
             """)
             rows = cur.fetchall()
-    else:
-        raise ValueError("Unsupported database type; expected .accdb or .sqlite")
-    return [r[0] for r in rows]
+    names = [r[0] for r in rows]
+    if dialect == "access":
+        _ACCESS_TABLES_CACHE[path] = (mtime, names)
+        return list(names)
+    return names
 
 def describe_table(db_path, table, verbose = True):
-    if db_path.endswith("accdb"):
+    if _db_dialect(db_path) == "access":
         with access_connection(db_path) as con:
-            cols, pk, fks = describe_access(con, table)
-    elif db_path.endswith("sqlite"):
+            cols, pk, fks = describe_access(con, table, path=db_path)
+    else:
         with sqlite_connection(db_path) as con:
             cols, pk, fks = describe_sqlite(con, table)
     if verbose:
@@ -104,22 +137,89 @@ def is_access_binary_type(type_name: str) -> bool:
     return (type_name or "").upper() in _ACCESS_BINARY_TYPES
 
 
+# Dates are stored as ISO8601 TEXT and booleans as 0/1 INTEGER. Binary data
+# is ignored during sync and stored as NULL-able TEXT fields in SQLite so
+# downstream consumers can treat the column like any other string column.
+# Anything unlisted falls back to TEXT.
+_TYPE_MAP = {
+    **{t: "INTEGER" for t in _ACCESS_NUMERIC_TYPES},
+    **{t: "REAL" for t in _ACCESS_REAL_TYPES},
+    **{t: "TEXT" for t in _ACCESS_DATE_TYPES},
+    **{t: "INTEGER" for t in _ACCESS_BOOLEAN_TYPES},
+    **{t: "TEXT" for t in _ACCESS_BINARY_TYPES},
+}
+
+
 def access_to_sqlite_type(type_name: str) -> str:
+    return _TYPE_MAP.get((type_name or "").upper(), "TEXT")
+
+def _lenient(convert):
+    """Apply `convert` to non-NULL values, keeping any value it rejects as-is."""
+    def apply(value):
+        if value is None:
+            return None
+        try:
+            return convert(value)
+        except (TypeError, ValueError, ArithmeticError):
+            return value
+    return apply
+
+
+_ACCESS_EXACT_TYPES = {"NUMERIC", "DECIMAL", "MONEY", "CURRENCY"}
+
+
+def _exact_int(value):
+    # int() truncates 1.5 to 1; pass non-integral numbers through unchanged
+    # so the driver or Access rejects them instead of losing the fraction
+    converted = int(value)
+    if not isinstance(value, (str, bytes)) and converted != value:
+        raise ValueError(value)
+    return converted
+
+
+_to_int = _lenient(_exact_int)
+_to_float = _lenient(float)
+_to_decimal = _lenient(lambda v: decimal.Decimal(str(v)))
+_to_bool = _lenient(lambda v: bool(int(v)))
+_to_datetime = _lenient(lambda v: datetime.datetime.fromisoformat(v) if isinstance(v, str) else v)
+_to_text = _lenient(lambda v: v if isinstance(v, (str, bytes, bytearray)) else str(v))
+
+
+def _access_converter(type_name: str):
     t = (type_name or "").upper()
     if t in _ACCESS_NUMERIC_TYPES:
-        return "INTEGER"
+        return _to_int
+    if t in _ACCESS_EXACT_TYPES:
+        return _to_decimal
     if t in _ACCESS_REAL_TYPES:
-        return "REAL"
-    if t in _ACCESS_DATE_TYPES:
-        return "TEXT"  # store ISO8601
+        return _to_float
     if t in _ACCESS_BOOLEAN_TYPES:
-        return "INTEGER"  # 0/1
+        return _to_bool
+    if t in _ACCESS_DATE_TYPES:
+        return _to_datetime
     if t in _ACCESS_BINARY_TYPES:
-        # Binary data is ignored during sync and stored as NULL-able TEXT
-        # fields in SQLite so downstream consumers can treat the column like
-        # any other string column.
-        return "TEXT"
-    return "TEXT"
+        return lambda v: v
+    return _to_text
+
+
+def access_param_coercer(cols: Sequence[dict]) -> Callable[[Sequence], tuple]:
+    """
+    Return a function converting a row read from SQLite, whose columns are
+    dynamically typed, to the Python types of the Access columns `cols`
+    declare. pyodbc's fast_executemany infers each parameter's type from the
+    first row and can truncate or reject later rows of another type.
+    """
+    converters = [_access_converter(c.get("type_name")) for c in cols]
+    return lambda row: tuple(convert(value) for convert, value in zip(converters, row))
+
+def single_int_pk(cols: Sequence[dict], pk_cols: Sequence[str]) -> bool:
+    """
+    True when the key is one Access column mapping to SQLite INTEGER, which
+    the SQLite copy declares as INTEGER PRIMARY KEY (an alias of the rowid).
+    """
+    if len(pk_cols) != 1:
+        return False
+    return any(c["name"] == pk_cols[0] and access_to_sqlite_type(c["type_name"]) == "INTEGER" for c in cols)
 
 def qident(name: str, dialect: str = 'sqlite') -> str:
     """
@@ -136,7 +236,7 @@ def table_exists(db_path: str, table: str) -> bool:
     table = table.strip()
     if not table:
         raise ValueError("Table name cannot be empty")
-    if db_path.endswith(".accdb"):
+    if _db_dialect(db_path) == "access":
         with access_connection(db_path) as con:
             cur = con.cursor()
             cur.execute("""
@@ -146,7 +246,7 @@ def table_exists(db_path: str, table: str) -> bool:
                   AND TABLE_NAME = ?
             """, [table])
             return cur.fetchone()[0] > 0
-    elif db_path.endswith(".sqlite"):
+    else:
         with sqlite_connection(db_path) as con:
             cur = con.cursor()
             cur.execute("""
@@ -156,14 +256,13 @@ def table_exists(db_path: str, table: str) -> bool:
                   AND name = ?
             """, [table])
             return cur.fetchone() is not None
-    else:
-        raise ValueError("Unsupported database type; expected .accdb or .sqlite")
 
-def same_columns(accdb_path: str, sqlite_path: str, table: str) -> bool:
-    def sig(db):
-        cols, _, _ = describe_table(db, table, verbose=False)
-        return [c["name"] for c in cols]
-    return sig(accdb_path) == sig(sqlite_path)
+def list_sqlite_objects(sqlite_path: str) -> set[str]:
+    """Names of every table and view in the SQLite database, in one query."""
+    with sqlite_connection(sqlite_path) as con:
+        cur = con.cursor()
+        cur.execute("SELECT name FROM sqlite_schema WHERE type IN ('table','view')")
+        return {r[0] for r in cur.fetchall()}
 
 def _format_value(value) -> str:
     if value is None:
@@ -227,17 +326,19 @@ def print_table(db_path: str, table: str, subsample: int = 5, vertical: bool = T
     easier to read for wide tables. Set `vertical=False` to switch to the
     traditional horizontal layout.
     """
-    if db_path.endswith("accdb"):
-        con_func, dialect = access_connection, "access"
-    elif db_path.endswith("sqlite"):
-        con_func, dialect = sqlite_connection, "sqlite"
-    else:
-        raise ValueError("Unsupported database type; expected .accdb or .sqlite")
+    dialect = _db_dialect(db_path)
+    con_func = access_connection if dialect == "access" else sqlite_connection
 
     with con_func(db_path) as con:
         cur = con.cursor()
-        cur.execute(f"SELECT * FROM {qident(table, dialect)}")
-        rows = cur.fetchmany(subsample)
+        # Let the database stop after the sample instead of producing the
+        # whole table
+        n = int(subsample)
+        if dialect == "access":
+            cur.execute(f"SELECT TOP {n} * FROM {qident(table, dialect)}")
+        else:
+            cur.execute(f"SELECT * FROM {qident(table, dialect)} LIMIT {n}")
+        rows = cur.fetchmany(n)
         headers = [desc[0] for desc in cur.description]
 
     if not rows:
@@ -3,104 +3,395 @@
 import os
 import sys
 import asyncio
+import functools
+import hashlib
+import io
 import json
 import logging
 import re
+import sqlite3
 import textwrap
+import threading
+import time
 from typing import Dict, Iterable, List, Optional, Sequence
 
 import openai
 
 from .config import read_token
 from .product import Product
+from .storage import DATA_DIR
+
+try:
+    import orjson  # optional; several times faster than json for parsing responses
+except ImportError:
+    orjson = None
 
 
 logger = logging.getLogger(__name__)
 
 openai.api_key = read_token('api.openai.com', 'mister-anderson-bot')
 
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
 
-async def upload_image(client, path):
-    logger.info(f"Uploading Image to OpenAI: {path}")
+# Caps concurrent file uploads across every in-flight analysis so a burst of
+# requests queues here instead of piling onto the client's connection pool.
+MAX_CONCURRENT_UPLOADS = 8
+_UPLOAD_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+# One client for the whole process so its HTTP connection pool (and the
+# TLS sessions in it) is reused across products.
+_client: Optional[openai.AsyncOpenAI] = None
+
+
+def get_client() -> openai.AsyncOpenAI:
+    global _client
+    if _client is None:
+        _client = openai.AsyncOpenAI(api_key=openai.api_key)
+    return _client
+
+
+LLM_MODEL = "gpt-4.1-mini"
+
+# Parsed-successfully LLM answers keyed by a SHA-256 of the model, prompt and
+# image bytes, so re-analyzing the same photos skips the uploads and the
+# model call. Each answer is one SQLite row, and the oldest rows beyond
+# LLM_CACHE_MAX_ENTRIES are dropped as new ones arrive.
+LLM_CACHE_PATH = os.path.join(DATA_DIR, "llm_cache.db")
+LLM_CACHE_MAX_ENTRIES = 5000
+
+# Uploaded photos keyed by their SHA-256, kept in the same database so
+# re-analyzing a product sends only the photos that changed. OpenAI may
+# delete a file at any time, so ids older than FILE_ID_MAX_AGE_SECONDS are
+# not reused, and ids the API no longer knows are dropped on first failure.
+FILE_ID_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+
+def _cache_key(prompt: str, images: Sequence[str]) -> str:
+    digest = hashlib.sha256(LLM_MODEL.encode())
+    digest.update(prompt.encode())
+    for path in images:
+        digest.update(_file_digest(path).encode())
+    return digest.hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    """SHA-256 hex digest of the file at `path`, memoized until it changes."""
+    st = os.stat(path)
+    return _file_digest_at(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _file_digest_at(path: str, mtime_ns: int, size: int) -> str:
     with open(path, "rb") as f:
-        result = await client.files.create(file=f, purpose="vision")
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _json_loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+_LLM_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses(
+  key TEXT PRIMARY KEY,
+  description TEXT NOT NULL,
+  stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_stored_at ON responses(stored_at);
+CREATE TABLE IF NOT EXISTS file_ids(
+  digest TEXT PRIMARY KEY,
+  file_id TEXT NOT NULL,
+  uploaded_at REAL NOT NULL
+);
+"""
+
+# The cache is read and written from asyncio.to_thread workers, and a
+# sqlite3 connection must not be shared between threads; each worker opens
+# one on first use and keeps it. The schema is created by the first one.
+_llm_cache_local = threading.local()
+_llm_cache_schema_lock = threading.Lock()
+_llm_cache_schema_ready = False
+
+
+def _llm_cache_connection() -> sqlite3.Connection:
+    global _llm_cache_schema_ready
+    con = getattr(_llm_cache_local, "con", None)
+    if con is None:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        con = sqlite3.connect(LLM_CACHE_PATH, timeout=30)
+        with _llm_cache_schema_lock:
+            if not _llm_cache_schema_ready:
+                con.executescript(_LLM_CACHE_SCHEMA)
+                _llm_cache_schema_ready = True
+        _llm_cache_local.con = con
+    return con
+
+
+def _cached_description(key: str) -> Optional[str]:
+    con = _llm_cache_connection()
+    row = con.execute("SELECT description FROM responses WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _store_description(key: str, description: str) -> None:
+    con = _llm_cache_connection()
+    with con:
+        con.execute(
+            "INSERT OR REPLACE INTO responses(key, description, stored_at) VALUES (?, ?, ?)",
+            (key, description, time.time()),
+        )
+        con.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (LLM_CACHE_MAX_ENTRIES,),
+        )
+
+
+def _cached_file_id(digest: str) -> Optional[str]:
+    con = _llm_cache_connection()
+    row = con.execute(
+        "SELECT file_id FROM file_ids WHERE digest = ? AND uploaded_at > ?",
+        (digest, time.time() - FILE_ID_MAX_AGE_SECONDS),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _store_file_id(digest: str, file_id: str) -> None:
+    con = _llm_cache_connection()
+    with con:
+        con.execute(
+            "INSERT OR REPLACE INTO file_ids(digest, file_id, uploaded_at) VALUES (?, ?, ?)",
+            (digest, file_id, time.time()),
+        )
+        con.execute(
+            "DELETE FROM file_ids WHERE uploaded_at <= ?",
+            (time.time() - FILE_ID_MAX_AGE_SECONDS,),
+        )
+
+
+def _forget_file_ids(file_ids: Iterable[str]) -> None:
+    con = _llm_cache_connection()
+    with con:
+        con.executemany("DELETE FROM file_ids WHERE file_id = ?", [(fid,) for fid in file_ids])
+
+
+async def upload_image(client, path):
+    async with _UPLOAD_SEMAPHORE:
+        logger.info("Uploading Image to OpenAI: %s", path)
+        # Read and shrink off the event loop; the semaphore bounds how many
+        # files are held in memory at once.
+        upload = await asyncio.to_thread(_upload_payload, path)
+        result = await client.files.create(file=upload, purpose="vision")
     return result.id
 
 
-async def ask_with_images(client, images, prompt):
-    ids = [await upload_image(client, path) for path in images]
-    response = await client.responses.create(
-        model="gpt-4.1-mini",
-        input=[{
-            "role": "user",
-            "content": [
-                {"type": "input_text", "text": prompt},
-                *[
-                    {"type": "input_image", "file_id": fid}
-                    for fid in ids
-                ]
+# The model downsamples large images anyway, so phone photos are shrunk to
+# this long edge and re-encoded as JPEG before upload.
+UPLOAD_MAX_EDGE = 1024
+UPLOAD_JPEG_QUALITY = 85
+
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _upload_payload(path: str) -> tuple:
+    """(filename, bytes[, content type]) for files.create, resized when Pillow is installed."""
+    st = os.stat(path)
+    resized = _resized_jpeg(path, st.st_mtime_ns, st.st_size)
+    if resized is None:
+        return os.path.basename(path), _read_bytes(path)
+    name = os.path.splitext(os.path.basename(path))[0] + ".jpg"
+    return name, resized, "image/jpeg"
+
+
+@functools.lru_cache(maxsize=64)
+def _resized_jpeg(path: str, mtime_ns: int, size: int) -> Optional[bytes]:
+    """
+    JPEG bytes of the image at `path` scaled to fit UPLOAD_MAX_EDGE, or None
+    when Pillow is missing or the image can't be read. `mtime_ns` and `size`
+    only key the cache, so retries of an unchanged photo skip the work.
+    """
+    try:
+        from PIL import Image, ImageOps  # optional; uploads the original file without it
+    except ImportError:
+        return None
+    try:
+        with Image.open(path) as im:
+            # Re-encoding drops EXIF, so apply the camera's rotation first
+            im = ImageOps.exif_transpose(im)
+            im.thumbnail((UPLOAD_MAX_EDGE, UPLOAD_MAX_EDGE))
+            buf = io.BytesIO()
+            im.convert("RGB").save(buf, "JPEG", quality=UPLOAD_JPEG_QUALITY, optimize=True)
+    except OSError:
+        logger.warning("Could not resize %s; uploading the original", path)
+        return None
+    return buf.getvalue()
+
+
+def _response_input(prompt: str, file_ids: Iterable[str]) -> List[Dict[str, object]]:
+    return [{
+        "role": "user",
+        "content": [
+            {"type": "input_text", "text": prompt},
+            *[
+                {"type": "input_image", "file_id": fid}
+                for fid in file_ids
             ]
-        }],
-    )
+        ]
+    }]
+
+
+async def upload_images(client, images, reuse: bool = True) -> tuple[List[str], bool]:
+    """
+    Upload `images` concurrently and return their file ids in order, plus
+    whether any of them was reused from an earlier upload. With `reuse`,
+    photos uploaded recently are not sent again; new uploads are recorded
+    either way.
+    """
+    async def upload(path):
+        digest = await asyncio.to_thread(_file_digest, path)
+        fid = await asyncio.to_thread(_cached_file_id, digest) if reuse else None
+        if fid is not None:
+            return fid, True
+        fid = await upload_image(client, path)
+        await asyncio.to_thread(_store_file_id, digest, fid)
+        return fid, False
+
+    # _UPLOAD_SEMAPHORE bounds how many uploads run at once
+    results = await asyncio.gather(*(upload(path) for path in images))
+    return [fid for fid, _ in results], any(hit for _, hit in results)
+
+
+async def ask_with_images(client, images, prompt):
+    ids, reused = await upload_images(client, images)
+    try:
+        response = await client.responses.create(
+            model=LLM_MODEL,
+            input=_response_input(prompt, ids),
+        )
+    except (openai.NotFoundError, openai.BadRequestError):
+        if not reused:
+            raise
+        # A reused file may have been deleted on OpenAI's side; forget the
+        # ids and try once more with fresh uploads
+        logger.warning("Request with previously uploaded files failed; uploading them again")
+        await asyncio.to_thread(_forget_file_ids, ids)
+        ids, _ = await upload_images(client, images, reuse=False)
+        response = await client.responses.create(
+            model=LLM_MODEL,
+            input=_response_input(prompt, ids),
+        )
     return response.output_text
 
 
+_PROMPT_GUIDANCE = " ".join((
+    "Always choose a destination code from the provided list. If you cannot determine a match, pick the closest option and explain why in destination_reason.",
+    "Items such as phones, tablets, usb drives, documents or hard drives MUST go to DATA SANITIZATION, which has code 6.",
+    "Prefer subcategories from the provided list. Suggest a new subcategory only when none of the provided values fit.",
+    "short_description must be a search-friendly product line: brand + model + item type + size/capacity/power and standout features; stay under 20 words; avoid vague filler.",
+    "For appliances, lab, and medical devices, include measurable attributes from labels (e.g., volume, temperature range, voltage/phase/amps, pressure, RPM, material/stainless).",
+    "If several model or part numbers appear, pick the primary model tied to the brand; only mention alternatives when truly ambiguous.",
+))
+
+# Only the option lists vary between calls; they fill {subcategories} and
+# {destinations}. Literal braces are doubled.
+_PROMPT_TEMPLATE = textwrap.dedent(
+    """
+    Extract product information from the attached image(s) and respond with strict JSON (no code fences, no commentary).
+    Required JSON keys:
+      - serial_number: string (often found in labels with bar codes, commonly referred to 'service tag' or 'S/N')
+      - short_description: concise, search-ready description (brand + model + item type + key specs/size/power; <=20 words)
+      - subcategory: value from `subcategory_options` when possible
+      - cod_destiny: integer destination code
+      - destination_label: matching text label for the selected destination
+      - destination_reason: concise explanation (<=20 words) of why this destination fits
+      - asset_tag: string (leave empty if unknown)
+
+    Context for classification:
+      • subcategory_options (sample): {subcategories}
+      • destination_options: {destinations}
+
+    Rules:
+      - {guidance}
+      - Use uppercase for destination_label exactly as provided in destination_options.
+      - If information is not visible, return an empty string for that field (do not use placeholder text).
+
+    Example response:
+    {{
+      "serial_number": "ABC12345",
+      "short_description": "Dell Latitude 7490 14-inch laptop",
+      "subcategory": "Laptop",
+      "cod_destiny": 6,
+      "destination_label": "DATA SANITIZATION",
+      "destination_reason": "Contains storage that must be wiped",
+      "asset_tag": ""
+    }}
+    """
+).strip()
+
+
 def _prepare_prompt(
     *,
     subcategory_options: Optional[Sequence[str]] = None,
     destiny_options: Optional[Sequence[Dict[str, object]]] = None,
 ) -> str:
-    subcategory_list = list(subcategory_options or [])
-    destiny_list = list(destiny_options or [])
+    # The options rarely change between products, so reduce them to hashable
+    # tuples and let _build_prompt's cache skip re-serializing them.
+    subcategories = tuple(subcategory_options or ())
+    destinies = tuple(
+        (str(item["code"]), item["label"])
+        for item in destiny_options or ()
+        if "code" in item and "label" in item
+    )
+    return _build_prompt(subcategories, destinies)
 
-    subcategory_json = json.dumps(subcategory_list[:80], ensure_ascii=False)
+
+@functools.lru_cache(maxsize=8)
+def _build_prompt(subcategory_list: Sequence[str], destiny_pairs: Sequence[tuple]) -> str:
+    # Compact separators: the whitespace would only cost prompt tokens
+    subcategory_json = json.dumps(subcategory_list[:80], ensure_ascii=False, separators=(",", ":"))
     subcategory_more = max(len(subcategory_list) - 80, 0)
 
-    destiny_map: Dict[str, object] = {str(item["code"]): item["label"] for item in destiny_list if "code" in item and "label" in item}
-    destiny_json = json.dumps(destiny_map, ensure_ascii=False)
-
-    guidance_lines: List[str] = []
-    guidance_lines.append("Always choose a destination code from the provided list. If you cannot determine a match, pick the closest option and explain why in destination_reason.")
-    guidance_lines.append("Items such as phones, tablets, usb drives, documents or hard drives MUST go to DATA SANITIZATION, which has code 6.")
-    guidance_lines.append("Prefer subcategories from the provided list. Suggest a new subcategory only when none of the provided values fit.")
-    guidance_lines.append("short_description must be a search-friendly product line: brand + model + item type + size/capacity/power and standout features; stay under 20 words; avoid vague filler.")
-    guidance_lines.append("For appliances, lab, and medical devices, include measurable attributes from labels (e.g., volume, temperature range, voltage/phase/amps, pressure, RPM, material/stainless).")
-    guidance_lines.append("If several model or part numbers appear, pick the primary model tied to the brand; only mention alternatives when truly ambiguous.")
-
-    prompt = textwrap.dedent(
-        f"""
-        Extract product information from the attached image(s) and respond with strict JSON (no code fences, no commentary).
-        Required JSON keys:
-          - serial_number: string (often found in labels with bar codes, commonly referred to 'service tag' or 'S/N')
-          - short_description: concise, search-ready description (brand + model + item type + key specs/size/power; <=20 words)
-          - subcategory: value from `subcategory_options` when possible
-          - cod_destiny: integer destination code
-          - destination_label: matching text label for the selected destination
-          - destination_reason: concise explanation (<=20 words) of why this destination fits
-          - asset_tag: string (leave empty if unknown)
-
-        Context for classification:
-          • subcategory_options (sample): {subcategory_json}{" (+" + str(subcategory_more) + " more)" if subcategory_more else ""}
-          • destination_options: {destiny_json}
-
-        Rules:
-          - {" ".join(guidance_lines)}
-          - Use uppercase for destination_label exactly as provided in destination_options.
-          - If information is not visible, return an empty string for that field (do not use placeholder text).
-
-        Example response:
-        {{
-          "serial_number": "ABC12345",
-          "short_description": "Dell Latitude 7490 14-inch laptop",
-          "subcategory": "Laptop",
-          "cod_destiny": 6,
-          "destination_label": "DATA SANITIZATION",
-          "destination_reason": "Contains storage that must be wiped",
-          "asset_tag": ""
-        }}
-        """
-    ).strip()
-    return prompt
+    destiny_map: Dict[str, object] = dict(destiny_pairs)
+    destiny_json = json.dumps(destiny_map, ensure_ascii=False, separators=(",", ":"))
+
+    subcategories = subcategory_json + (f" (+{subcategory_more} more)" if subcategory_more else "")
+    return _PROMPT_TEMPLATE.format(
+        subcategories=subcategories,
+        destinations=destiny_json,
+        guidance=_PROMPT_GUIDANCE,
+    )
+
+
+def _find_images(folder: str) -> List[str]:
+    with os.scandir(folder) as entries:
+        # Sorted so the same photos always produce the same cache key
+        images = sorted(
+            e.path for e in entries
+            if os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS and e.is_file()
+        )
+    if logger.isEnabledFor(logging.INFO):
+        for path in images:
+            logger.info("Image Found: %s", os.path.basename(path))
+    return images
+
+
+def _apply_description(product: Product, description: str) -> bool:
+    """Store the LLM answer on `product`; True when it parsed as JSON."""
+    product.description_raw = description
+    logger.info("Description: %s", description)
+
+    try:
+        parsed = _json_loads(description)
+        logger.info("Parsed Description: %s", parsed)
+    except ValueError:  # json and orjson decode errors both subclass it
+        logger.warning("Description from LLM could not be parsed as JSON.")
+        return False
+    if isinstance(parsed, dict) and "commodity" in parsed and "subcategory" not in parsed:
+        parsed["subcategory"] = parsed.pop("commodity")
+    product.description_json = parsed
+    return True
 
 
 async def process_product_folder(
@@ -108,37 +399,35 @@ async def process_product_folder(
     *,
     subcategory_options: Optional[Sequence[str]] = None,
     destiny_options: Optional[Sequence[Dict[str, object]]] = None,
+    refresh: bool = False,
 ) -> Product:
-    logger.info(f"Processing Product with OpenAI: {product}")
-    client = openai.AsyncOpenAI(api_key=openai.api_key)
-
-    images = []
-    for f in os.listdir(product.tempdir):
-        if f.lower().endswith((".jpg", ".jpeg", ".png")):
-            images.append(os.path.join(product.tempdir, f))
-            logger.info(f"Image Found: {f}")
+    """
+    Describe the product from the images in its tempdir. A cached answer for
+    the same prompt and photos is reused unless `refresh` is set, in which
+    case the model is asked again and its answer replaces the cached one.
+    """
+    logger.info("Processing Product with OpenAI: %s", product)
+    client = get_client()
 
+    images = _find_images(product.tempdir)
     if not images:
-        logger.info(f"No Images Available for Product: {product}")
+        logger.info("No Images Available for Product: %s", product)
         return
 
     prompt = _prepare_prompt(
         subcategory_options=subcategory_options,
         destiny_options=destiny_options,
     )
-    description = await ask_with_images(client, images, prompt)
-    product.description_raw = description
-    logger.info(f"Description: {description}")
-
-    try:
-        parsed = json.loads(description)
-        logger.info(f"Parsed Description: {parsed}")
-    except:
-        logger.warning("Description from LLM could not be parsed as JSON.")
+    key = await asyncio.to_thread(_cache_key, prompt, images)
+    description = None if refresh else await asyncio.to_thread(_cached_description, key)
+    cached = description is not None
+    if cached:
+        logger.info("Using cached analysis for Product: %s", product)
     else:
-        if isinstance(parsed, dict) and "commodity" in parsed and "subcategory" not in parsed:
-            parsed["subcategory"] = parsed.pop("commodity")
-        product.description_json = parsed
+        description = await ask_with_images(client, images, prompt)
+    # Only answers that parsed are reused; a retry should get a fresh one
+    if _apply_description(product, description) and not cached:
+        await asyncio.to_thread(_store_description, key, description)
     logger.info("Analysis Complete.")
     return product
 
@@ -148,7 +437,7 @@ if __name__ == '__main__':
         images = sys.argv[1:]  # Pass image paths as arguments
         if not images:
             raise Exception("Usage: python llm.py img1.jpg img2.png ...")
-        client = openai.AsyncOpenAI(api_key=openai.api_key)
+        client = get_client()
         result = await ask_with_images(client, images, "What do you see?")
         logger.info("LLM response: %s", result)
     asyncio.run(main())
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+import logging
+
+
+LOG_FORMAT = "%(asctime)s - %(threadName)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def setup(level: int = logging.INFO) -> None:
+    """
+    Configure the root logger for command-line entry points.
+
+    Library modules only create loggers; the script being run calls this once
+    so importing a module never installs handlers as a side effect.
+    """
+    logging.basicConfig(format=LOG_FORMAT, level=level)
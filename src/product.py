@@ -29,7 +29,7 @@ class Product:
     def asset_tag(self) -> str:
         to_hash = f"{self.created_at}-{self.created_by}"
         digest = hashlib.sha1(to_hash.encode()).hexdigest()[:10]
-        logger.info(f"Asset tag is {digest}")
+        logger.info("Asset tag is %s", digest)
         return digest
 
     @property
@@ -86,11 +86,11 @@ class Product:
             return None
 
     def __post_init__(self):
-        logger.info(f"New Instance of {repr(self)}")
+        logger.info("New Instance of %r", self)
         atexit.register(self.clean_tempdir)
 
     def clean_tempdir(self):
-        logger.info(f"Cleaning up {self.tempdir}")
+        logger.info("Cleaning up %s", self.tempdir)
         shutil.rmtree(self.tempdir, ignore_errors = True)
 
 
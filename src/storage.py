@@ -115,7 +115,7 @@ def save_product_sqlite(product: Product):
             photos_field,
         ))
         con.commit()
-        logger.info(f"Saved product {product.asset_tag} to {DB_PATH}")
+        logger.info("Saved product %s to %s", product.asset_tag, DB_PATH)
     finally:
         con.close()
 
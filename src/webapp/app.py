@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import asyncio
 import json
 import logging
 import os
@@ -39,6 +40,7 @@ from .iassets import (
     update_iassets_field,
     warm_access_connection,
 )
+from ..logging_setup import setup as setup_logging
 from ..product import Product
 from ..llm import process_product_folder
 from .uploads import (
@@ -46,6 +48,7 @@ from .uploads import (
     AnalysisPayload,
     begin_session,
     cleanup_session,
+    ensure_upload_root,
     is_valid_session_id,
     iter_session_files,
     load_analysis,
@@ -56,10 +59,9 @@ from .uploads import (
 )
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
+# uvicorn imports this module itself (again in each reload worker), so the
+# app configures logging here rather than in main()
+setup_logging()
 
 TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
@@ -71,7 +73,7 @@ app.add_middleware(
     same_site="lax",
 )
 
-PRODUCT_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+ensure_upload_root()
 
 
 class ProductFieldUpdate(BaseModel):
@@ -122,6 +124,12 @@ def consume_flash(request: Request) -> Optional[dict]:
     return request.session.pop("_flash", None)
 
 
+async def _read_uploads(uploads: List[UploadFile]) -> List[Tuple[str, bytes]]:
+    # UploadFile.read() runs in the threadpool, so the reads can overlap.
+    contents = await asyncio.gather(*(upload.read() for upload in uploads))
+    return [(upload.filename or "", data) for upload, data in zip(uploads, contents)]
+
+
 @app.on_event("startup")
 async def startup_event():
     init_db()
@@ -411,10 +419,7 @@ async def create_product_route(
                 product.description_json = {}
                 product.description_raw = ""
         elif has_photos:
-            file_payloads: List[Tuple[str, bytes]] = []
-            for upload in valid_files:
-                contents = await upload.read()
-                file_payloads.append((upload.filename or "", contents))
+            file_payloads = await _read_uploads(valid_files)
 
             try:
                 validate_uploads(file_payloads)
@@ -422,7 +427,8 @@ async def create_product_route(
                 set_flash(request, str(exc), "error")
                 return RedirectResponse(url=redirect_url, status_code=status.HTTP_302_FOUND)
 
-            saved_files = persist_bytes(
+            saved_files = await asyncio.to_thread(
+                persist_bytes,
                 staging_dir,
                 Path(product.tempdir),
                 file_payloads,
@@ -641,6 +647,7 @@ async def analyze_product_photos(
     pickup_number: int,
     cod_assets: int,
     photos: Optional[List[UploadFile]] = File(None),
+    refresh: bool = Form(False),
 ):
     user, redirect_resp = ensure_access(
         request, allowed_roles=("employee", "supervisor", "admin")
@@ -652,10 +659,7 @@ async def analyze_product_photos(
     if not uploads:
         return JSONResponse({"status": "error", "message": "Please add at least one image."}, status_code=400)
 
-    file_payloads: List[Tuple[str, bytes]] = []
-    for upload in uploads:
-        contents = await upload.read()
-        file_payloads.append((upload.filename or "", contents))
+    file_payloads = await _read_uploads(uploads)
 
     try:
         validate_uploads(file_payloads)
@@ -672,12 +676,13 @@ async def analyze_product_photos(
     product.pickup = str(pickup_number)
 
     try:
-        persist_bytes(session_dir, Path(product.tempdir), file_payloads)
+        await asyncio.to_thread(persist_bytes, session_dir, Path(product.tempdir), file_payloads)
 
         await process_product_folder(
             product,
             subcategory_options=subcategory_options,
             destiny_options=destiny_options,
+            refresh=refresh,
         )
 
         data = product.description_json or {}
@@ -280,12 +280,25 @@ def _refresh_subcategory_cache(client_id: Optional[int] = None) -> _SubcategoryC
     if source_client_id is not None:
         keys_to_update.add(source_client_id)
     keys_to_update.add(client_id)
+    _prune_subcategory_cache(now)
     for key in keys_to_update:
         _SUBCATEGORY_CACHE[key] = entry
 
     return entry
 
 
+def _prune_subcategory_cache(now: float) -> None:
+    # Entries are keyed per client, so drop expired ones on each refresh
+    # instead of keeping one for every client ever looked up.
+    expired = [
+        key
+        for key, cached in _SUBCATEGORY_CACHE.items()
+        if (now - float(cached.get("timestamp", 0.0))) >= _HINT_CACHE_TTL
+    ]
+    for key in expired:
+        _SUBCATEGORY_CACHE.pop(key, None)
+
+
 def get_subcategory_suggestions(client_id: Optional[int] = None) -> List[str]:
     entry = _refresh_subcategory_cache(client_id)
     values = entry.get("values") or ()
@@ -1,5 +1,6 @@
 import json
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Sequence, Tuple
@@ -15,7 +16,7 @@ logger = logging.getLogger(__name__)
 UPLOAD_ROOT = PRODUCT_UPLOAD_DIR
 SESSION_PREFIX = "session_"
 ANALYSIS_FILENAME = "analysis.json"
-ALLOWED_SUFFIXES = {".jpg", ".jpeg", ".png", ".heic", ".heif", ".webp"}
+ALLOWED_SUFFIXES = frozenset({".jpg", ".jpeg", ".png", ".heic", ".heif", ".webp"})
 MAX_FILES = 10
 MAX_TOTAL_BYTES = 25 * 1024 * 1024  # 25 MiB
 SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
@@ -33,7 +34,7 @@ def ensure_upload_root() -> None:
 
 
 def base_dir_for(pickup_number: int, cod_assets: int) -> Path:
-    ensure_upload_root()
+    # The root is created once at app import; begin_session creates the rest.
     return UPLOAD_ROOT / f"pickup_{pickup_number}" / f"pallet_{cod_assets}"
 
 
@@ -54,8 +55,9 @@ def is_valid_session_id(session_id: str) -> bool:
 
 
 def normalise_suffix(filename: Optional[str]) -> str:
-    suffix = Path(filename or "").suffix.lower()
-    return suffix or ".jpg"
+    suffix = os.path.splitext(filename or "")[1].lower()
+    # splitext keeps a bare trailing dot ("photo."); Path.suffix did not.
+    return suffix if len(suffix) > 1 else ".jpg"
 
 
 def validate_uploads(uploads: Sequence[Tuple[str, bytes]]) -> None:
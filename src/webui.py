@@ -13,14 +13,11 @@ from flask import Flask, g, render_template_string, send_from_directory, abort,
 
 from .config import read_basic_users, read_token
 from .storage import PRODUCTS_DIR, DB_PATH, init_db, list_products, get_product
+from .logging_setup import setup as setup_logging
 
 
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
 
 app = Flask(__name__)
 
@@ -29,8 +26,6 @@ try:
 except Exception:
     app.secret_key = os.urandom(32).hex()  # fallback (ephemeral)
 
-WEB_USERS = read_basic_users()
-
 
 def login_required(fn):
     @functools.wraps(fn)
@@ -219,39 +214,47 @@ class Notifier:
 
 notifier = Notifier()
 
-def _db_stats_since(last_id: int):
-    logger.info("Querying DB for Updates...")
-    con = sqlite3.connect(DB_PATH)
-    try:
-        cur = con.cursor()
-        # New rows since last_id
-        cur.execute("SELECT id, asset_tag FROM products WHERE id > ? ORDER BY id ASC", (last_id,))
-        new_rows = cur.fetchall()
-        # Total count (optional, useful if you want to display counts)
-        cur.execute("SELECT COUNT(1), COALESCE(MAX(id), 0) FROM products")
-        count, max_id = cur.fetchone()
-        return new_rows, count or 0, max_id or 0
-    finally:
-        con.close()
+def _db_stats_since(last_id: int, con: sqlite3.Connection):
+    logger.debug("Querying DB for Updates...")
+    cur = con.cursor()
+    # New rows since last_id
+    cur.execute("SELECT id, asset_tag FROM products WHERE id > ? ORDER BY id ASC", (last_id,))
+    new_rows = cur.fetchall()
+    # Total count (optional, useful if you want to display counts)
+    cur.execute("SELECT COUNT(1), COALESCE(MAX(id), 0) FROM products")
+    count, max_id = cur.fetchone()
+    return new_rows, count or 0, max_id or 0
+
+def _data_version(con: sqlite3.Connection) -> int:
+    # Changes whenever another connection commits to the database file, so the
+    # watcher only runs the product queries when something was written.
+    return con.execute("PRAGMA data_version").fetchone()[0]
 
 def _watch_db(interval=1.0):
+    # Keep one connection open for the lifetime of the watcher; data_version
+    # is only meaningful relative to the connection that reads it.
+    con = sqlite3.connect(DB_PATH)
     # Initialize last_seen from DB
-    _, _, last_seen = _db_stats_since(0)
+    _, _, last_seen = _db_stats_since(0, con)
+    last_version = _data_version(con)
     last_keepalive = time.time()
     while True:
         time.sleep(interval)
         try:
-            new_rows, count, max_id = _db_stats_since(last_seen)
-            if new_rows:
-                logger.info(f"{len(new_rows)} new rows found in DB.")
-                last_seen = max_id
-                payload = {
-                    "new": [r[1] for r in new_rows],  # asset_tags
-                    "count": count,
-                    "max_id": max_id,
-                }
-                logger.info(f"Payload: {repr(payload)}")
-                notifier.publish(payload)
+            version = _data_version(con)
+            if version != last_version:
+                last_version = version
+                new_rows, count, max_id = _db_stats_since(last_seen, con)
+                if new_rows:
+                    logger.info("%d new rows found in DB.", len(new_rows))
+                    last_seen = max_id
+                    payload = {
+                        "new": [r[1] for r in new_rows],  # asset_tags
+                        "count": count,
+                        "max_id": max_id,
+                    }
+                    logger.info("Payload: %r", payload)
+                    notifier.publish(payload)
             # Keep-alive every 15s to prevent idle proxies from closing
             if time.time() - last_keepalive > 15:
                 logger.info("Pinging.")
@@ -266,7 +269,9 @@ def login():
     if request.method == "POST":
         u = request.form.get("username","")
         p = request.form.get("password","")
-        if WEB_USERS.get(u) == p:
+        # read_basic_users is cached on ~/.authinfo's mtime, so this is a dict
+        # lookup that still sees credential edits without a restart.
+        if read_basic_users().get(u) == p:
             session["user"] = u
             return redirect(request.args.get("next") or url_for("index"))
         return render_template_string(LOGIN_TMPL, error="Invalid credentials.")
@@ -328,6 +333,7 @@ def serve_file(asset_tag, filename):
     return send_from_directory(safe_dir, filename)
 
 def main():
+    setup_logging()
     init_db()
     # Start background DB watcher
     threading.Thread(target=_watch_db, daemon=True).start()
@@ -0,0 +1,48 @@
+import sqlite3
+
+from src.db.sync import sync_sqlite_tables
+
+
+def test_sqlite_copy_creates_parents_before_children(tmp_path):
+    src = tmp_path / "a.sqlite"
+    dst = tmp_path / "b.sqlite"
+    con = sqlite3.connect(src)
+    con.executescript("""
+        CREATE TABLE People (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE Orders (id INTEGER PRIMARY KEY,
+                             person_id INTEGER REFERENCES People(id));
+        INSERT INTO People VALUES (1, 'Ada'), (2, 'Grace');
+        INSERT INTO Orders VALUES (10, 1), (11, 2);
+    """)
+    con.close()
+
+    # "Orders" sorts before "People", so alphabetical order would load the child first
+    sync_sqlite_tables(str(src), str(dst))
+
+    con = sqlite3.connect(dst)
+    assert con.execute("SELECT * FROM People ORDER BY id").fetchall() == [(1, "Ada"), (2, "Grace")]
+    assert con.execute("SELECT * FROM Orders ORDER BY id").fetchall() == [(10, 1), (11, 2)]
+    con.close()
+
+
+def test_sqlite_copy_matches_keyless_tables_by_rowid(tmp_path):
+    src = tmp_path / "a.sqlite"
+    dst = tmp_path / "b.sqlite"
+    con = sqlite3.connect(src)
+    con.executescript("""
+        CREATE TABLE NOPK (a, b);
+        INSERT INTO NOPK VALUES (1, 'x'), (2, 'y');
+    """)
+    con.close()
+
+    sync_sqlite_tables(str(src), str(dst))
+    con = sqlite3.connect(src)
+    con.execute("UPDATE NOPK SET b = 'z' WHERE a = 2")
+    con.commit()
+    con.close()
+    # A second run updates the copied rows instead of appending duplicates
+    sync_sqlite_tables(str(src), str(dst))
+
+    con = sqlite3.connect(dst)
+    assert con.execute("SELECT a, b FROM NOPK ORDER BY a").fetchall() == [(1, "x"), (2, "z")]
+    con.close()
@@ -0,0 +1,35 @@
+import datetime
+import decimal
+
+from src.db.utils import access_param_coercer
+
+
+def coerce(type_name, *values):
+    convert = access_param_coercer([{"name": "c", "type_name": type_name}])
+    return [convert((value,))[0] for value in values]
+
+
+def test_integer_columns_convert_whole_numbers():
+    assert coerce("LONG", 7, 7.0, "7", decimal.Decimal("7"), True, None) == [7, 7, 7, 7, 1, None]
+    assert all(type(v) is int for v in coerce("INTEGER", 7.0, "7", decimal.Decimal("7"), True))
+
+
+def test_integer_columns_pass_fractions_through():
+    # Truncating 1.5 to 1 would silently change the data written to Access
+    assert coerce("LONG", 1.5, "1.5", decimal.Decimal("2.5")) == [1.5, "1.5", decimal.Decimal("2.5")]
+    assert type(coerce("LONG", 1.5)[0]) is float
+
+
+def test_real_exact_and_boolean_columns():
+    assert coerce("DOUBLE", 2, "2.5") == [2.0, 2.5]
+    assert coerce("CURRENCY", 1.1) == [decimal.Decimal("1.1")]
+    assert coerce("YESNO", 0, 1, "1") == [False, True, True]
+
+
+def test_datetime_columns_parse_iso_text():
+    stamp = datetime.datetime(2024, 5, 6, 7, 8, 9)
+    assert coerce("DATETIME", "2024-05-06 07:08:09", stamp, "not a date") == [stamp, stamp, "not a date"]
+
+
+def test_text_columns_stringify_non_text():
+    assert coerce("VARCHAR", 12, "abc", b"raw", None) == ["12", "abc", b"raw", None]